@@ -0,0 +1,166 @@
+# Betterinput benchmarks
+# Author: Gex97
+#
+# usage:
+#   python benchmarks/bench_betterinput.py                        -> runs every case
+#   python benchmarks/bench_betterinput.py --save baseline.json   -> stores the results
+#   python benchmarks/bench_betterinput.py --compare baseline.json -> flags the regressions (exit code 1)
+
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tracemalloc
+from typing import Any, Callable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import betterinput as bti
+
+# name: (types, line)
+SHAPES: dict[str, tuple[list, str]] = {
+    "homogeneous": ([int], " ".join(str(n) for n in range(16))),
+    "mixed": ([int, float, str, int, float, str], "1 2.5 abc 42 -0.75 xyz"),
+    "typed_iterable": ([int, [int]], "7 [1,2,3,4,5,6,7,8]"),
+    "type_list": ([int, [str, int, float], str], "1 [a,2,3.5] end"),
+    "containers": ([tuple, set], "(a,b,c,d) {1,2,3,4}"),
+    "errors": ([int, float, int, float], "1 x 3 y"),
+}
+
+class Status:
+    """ A custom type built from a token (like the enums of a feed) """
+    def __init__(self, name: str):
+        self.name = name.strip().upper()
+
+def _with_stdin(text: str, run: Callable[[], Any]) -> Any:
+    """ Runs `run` reading from a synthetic stdin containing `text` """
+    stdin = sys.stdin
+    sys.stdin = io.StringIO(text)
+    try:
+        return run()
+    finally:
+        sys.stdin = stdin
+
+def _cases(lines: int) -> dict[str, Callable[[], Any]]:
+    """ Returns the benchmark cases, every case processes `lines` lines """
+    device = bti.InputDevice() # no warnings and no exceptions, errors are only counted in the timings
+    cases: dict[str, Callable[[], Any]] = {}
+
+    def get_input():
+        text = "12345\n" * lines
+        return _with_stdin(text, lambda: [device.get_input(cast_type=int) for _ in range(lines)])
+
+    cases["get_input/int"] = get_input
+
+    # a whole block of homogeneous lines read at once
+    def get_matrix(storage: str):
+        text = (SHAPES["homogeneous"][1] + "\n") * lines
+        return _with_stdin(text, lambda: device.get_matrix(lines, [int], storage=storage))
+
+    cases["get_matrix/list"] = lambda: get_matrix("list")
+    cases["get_matrix/array"] = lambda: get_matrix("array")
+
+    # low-cardinality columns cast by a class constructor, with and without the converter memo
+    memo_device = bti.InputDevice()
+    memo_device.register_converter(Status, memo=64)
+    statuses = ["OK", "FAIL", "RETRY", "OK", "OK", "SKIP"]
+    cases["process_data/low_cardinality"] = lambda: [device.process_data(list(statuses), [Status]) for _ in range(lines)]
+    cases["process_data/low_cardinality_memo"] = lambda: [memo_device.process_data(list(statuses), [Status]) for _ in range(lines)]
+
+    # every construction / set_attribute call counts as a line
+    cases["device/construct"] = lambda: [bti.InputDevice(False, False, 5) for _ in range(lines)]
+    cases["device/set_attribute"] = lambda: [device.set_attribute("streamsize", 5) for _ in range(lines)]
+
+    for name, (types, line) in SHAPES.items():
+        def get_multiple_input(types=types, line=line):
+            text = (line + "\n") * lines
+            return _with_stdin(text, lambda: [device.get_multiple_input(types) for _ in range(lines)])
+
+        def process_data(types=types, line=line):
+            values = line.split(" ")
+            return [device.process_data(list(values), types) for _ in range(lines)]
+
+        def validate(types=types, line=line):
+            values = line.split(" ")
+            return [device.process_data(list(values), types, validate=True) for _ in range(lines)]
+
+        cases[f"get_multiple_input/{name}"] = get_multiple_input
+        cases[f"process_data/{name}"] = process_data
+        cases[f"validate/{name}"] = validate
+
+    return cases
+
+def measure(run: Callable[[], Any], lines: int, repeat: int) -> dict[str, float]:
+    """ Returns the best lines/sec over `repeat` runs and the allocations of a single run """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        result = run()
+        retained, peak = tracemalloc.get_traced_memory() # retained: memory still used by the results
+        del result
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "lines_per_sec": lines / best,
+        "alloc_peak_kib": peak / 1024,
+        "alloc_retained_kib": retained / 1024,
+    }
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """ Returns a message for every case slower (or allocating more) than the baseline by more than `tolerance` """
+    regressions: list[str] = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+
+        if result["lines_per_sec"] < base["lines_per_sec"] * (1 - tolerance):
+            regressions.append(f"{name}: {result['lines_per_sec']:,.0f} lines/s, baseline {base['lines_per_sec']:,.0f} lines/s")
+        if result["alloc_peak_kib"] > base["alloc_peak_kib"] * (1 + tolerance):
+            regressions.append(f"{name}: peak {result['alloc_peak_kib']:,.1f} KiB, baseline {base['alloc_peak_kib']:,.1f} KiB")
+
+    return regressions
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Betterinput benchmarks")
+    parser.add_argument("--lines", type=int, default=20000, help="lines processed by every case")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs of every case (the best one is kept)")
+    parser.add_argument("--filter", default="", help="runs only the cases containing this text")
+    parser.add_argument("--save", metavar="FILE", help="stores the results into a json file")
+    parser.add_argument("--compare", metavar="FILE", help="compares the results with a baseline json file")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed slowdown before a case is a regression (default 0.10)")
+    args = parser.parse_args(argv)
+
+    results: dict[str, dict] = {}
+    for name, run in _cases(args.lines).items():
+        if args.filter in name:
+            results[name] = measure(run, args.lines, args.repeat)
+            print(f"{name:<36} {results[name]['lines_per_sec']:>14,.0f} lines/s {results[name]['alloc_peak_kib']:>12,.1f} KiB peak {results[name]['alloc_retained_kib']:>12,.1f} KiB retained")
+
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump({"version": bti.__version__, "python": platform.python_version(), "lines": args.lines, "results": results}, file, indent=4)
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)["results"]
+
+        regressions = compare(results, baseline, args.tolerance)
+        for message in regressions:
+            print(f"REGRESSION {message}")
+
+        return 1 if regressions else 0
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,363 +1,1361 @@
-# Betterinput library
-# Author: Gex97
-
-__version__ = "0.3.5"
-__author__  = "Gex97"
-
-from typing import Any, final
-from accessify import private
-from libexceptions import *
-
-class InputDevice:
-    """Input device that improves input operations.
-    
-        constructor:
-            params:
-                `warnings`       : bool #private property
-                `raise_exception`: bool #private property
-                `streamsize`     : int  #private property
-                `kit`            : dict #private
-                
-        use set_attribute(attr, value) to change their value\n
-        A direct access to one of those attributes raises an exception (future patch will handle this exception)
-    """
-
-    default_kit: dict[str, str] = {
-        "separator": " ",
-        "iter_separator":",",
-        "text": ""
-    }
-
-    def __init__(self, warnings:bool=False, raise_exceptions:bool=False, streamsize:int=None, kit:dict=default_kit):
-        self.warnings = warnings
-        self.raise_exceptions = raise_exceptions
-        self.streamsize = streamsize
-        self.kit = kit
-        if not self.__check_kit():
-            self.kit = InputDevice.default_kit
-    
-    @property
-    def streamsize(self):
-        return self._streamsize
-    
-    @streamsize.setter
-    @private
-    def streamsize(self, size:int):
-        """ streamsize property setter, use set_attribute("streamsize", value: int) to change its value """
-        if isinstance(size, int):
-            self._streamsize = size if size > 0 else None
-        elif size is None:
-            self._streamsize = None
-        else:
-            raise TypeError(f"Invalid value type for \"streamsize\" expected int or None, found {type(size).__name__}")
-    
-    @property
-    def warnings(self):
-        return self._warnings
-    
-    @warnings.setter
-    @private
-    def warnings(self, state:bool):
-        """ warnings property setter, use set_attribute("warnings", value: bool) to change its value """
-        if isinstance(state, bool):
-            self._warnings = state
-        else:
-            raise TypeError(f"Invalid value type for \"warnings\" expected bool, found {type(state).__name__}")
-    
-    @property
-    def raise_exceptions(self):
-        return self._raise_exceptions
-     
-    @raise_exceptions.setter
-    @private
-    def raise_exceptions(self, state:bool):
-        """ raise_exceptions property setter, use set_attribute("raise_exceptions", value: bool) to change its value """
-        if isinstance(state, bool):
-            self._raise_exceptions = state
-        else:
-            raise TypeError(f"Invalid value type for \"raise_exception\" expected bool, found {type(state).__name__}")
-    
-    @final
-    def set_attribute(self, attr, value):
-        if attr and value is not None:
-            if hasattr(self, attr):
-                try:
-                    self.__setattr__(attr, value)
-                except AttributeError:
-                    return
-            else:
-                raise AttributeError(f"Attribute: {attr} not found")
-        else:
-            raise WrongArgumentError("Invalid arguments: {}, {}".format(attr, value))
-
-    @private
-    def __check_kit(self):
-        if len(self.kit) == len(InputDevice.default_kit):
-            for item in list(self.kit.keys()):
-                try:
-                    if not self.kit[item] or type(self.kit[item]).__name__ != type(InputDevice.default_kit[item]).__name__:
-                        return False
-                except KeyError:
-                    return False
-
-            return True
-
-        return False
-
-    def process_data(self, values:list=None, types:list[type]=[str], iter_separator: str = ",", input_streamsize:int=None):
-        """This function gets a list containing some values
-            
-            Then the inputs are casted to the type we put at the same position into `types`
-            
-            params:
-                `values`:list, default:None -> this list contains the values to process
-                
-                `types`:list, default:[str] -> this list contains the types to cast the values to
-                
-                `input_streamsize`:int, default: None -> substitute property self.streamsize without changing its value (value can be higher than self.streamsize)
-                
-            returns:
-                `values`:list -> This list contains the elaborated data insert in input
-                
-            ~ If self.warnings is set on True, the function will show you any warnings/errors ~
-            
-            ~ If self.raise_exceptions is set on True, the function will raise exceptions if needed ~
-        """
-        if type(values) not in (list, tuple):
-            if self.raise_exceptions:
-                raise TypeListError("Couldn't cast values: parameter \"values\" should be of type list or tuple, not {}".format(type(values).__name__))
-            elif self.warnings:
-                print("Warning: Couldn't cast values: parameter \"values\" should be of type list or tuple, not {}".format(type(values).__name__))
-        
-        if not input_streamsize:
-            input_streamsize = self.streamsize
-        elif input_streamsize == -1:
-            input_streamsize = None
-        elif input_streamsize < 1:
-            input_streamsize = self.streamsize
-        
-        values:list[str] = values[0:input_streamsize if input_streamsize else None] # gets the input from index 0 to input_streamsize, if input_streamsize is None gets all the values from 0 to self.streamsize (if None gets all the values)
-        
-        if type(types) not in (list, tuple):
-            if self.raise_exceptions:
-                raise TypeListError("Couldn't cast values: parameter \"types\" should be of type  list or tuple, not {}".format(type(types).__name__))
-            elif self.warnings:
-                print("Warning: Couldn't cast values: parameter \"types\" should be of type list or tuple, not {}".format(type(types).__name__))
-         
-        elif len(types) != len(values) and len(types) != 1:
-            if self.raise_exceptions:
-                raise TypeListError("Invalid number of values: expected {}, got {}".format(len(types), len(values)))
-            elif self.warnings:
-                print("Warning: Invalid number of values: expected {}, got {}".format(len(types), len(values)))
-
-        else:
-            if len(types) != 1 and not all([types[x]==types[x+1] for x in range(len(types)-1)]):
-                for i in range(len(values)):
-                    skip_checks = True # Maybe this will be changed in future
-                    try:
-                        try:
-                            if isinstance(types[i], type):
-                                _ = iter(types[i]())
-                                del _
-                                
-                                # Is iterable (not list of types)
-                                # returns an object of the given iterable type
-                                _v = values[i].strip()
-                                
-                                if _v.startswith("(") and _v.endswith(")") or _v.startswith("[") and _v.endswith("]") or _v.startswith("{") and _v.endswith("}"):
-                                    values[i] = types[i]([x for x in values[i][1:-1].split(iter_separator)])
-                                else:
-                                    if self.raise_exceptions:
-                                        raise ValueError(f"Invalid iterable syntax <{values[i]}>")
-                                    elif self.warnings:
-                                        print(f"Warning: Invalid iterable syntax <{values[i]}> [returning]")
-                                    
-                                    return values
-                            else:
-                                _: Any = types[i][0] # tries to get the first element of the, maybe, iterable. If it fails then it's not an iterable
-                                
-                                # Is iterable (is list of types)
-                                # It will return a list object
-                                if len(types[i]) == 1:
-                                    try:
-                                        _v = values[i].strip()
-                                        
-                                        if _v.startswith("(") and _v.endswith(")") or _v.startswith("[") and _v.endswith("]") or _v.startswith("{") and _v.endswith("}"):
-                                            values[i] = [types[i][0](x) for x in values[i][1:-1].split(iter_separator)]
-                                        else:
-                                            if self.raise_exceptions:
-                                                raise ValueError(f"Invalid iterable syntax <{values[i]}>")
-                                            elif self.warnings:
-                                                print(f"Warning: Invalid iterable syntax <{values[i]}> [returning]")
-                                            
-                                            return values
-                                    except ValueError as err:
-                                        if self.raise_exceptions:
-                                            raise TypeListError("Couldn't cast {} to {} due an error... {}".format(values[i], types[i][0].__name__, err))
-                                        elif self.warnings:
-                                            print("Warning: Couldn't cast {} to {} due an error... {}".format(values[i], types[i][0].__name__, err))
-                                            
-                                        continue
-                                else:
-                                    try:
-                                        _types: list = [t for t in types[i]]
-                                        _v: str = values[i].strip()
-                                        
-                                        try:
-                                            if _v.startswith("(") and _v.endswith(")") or _v.startswith("[") and _v.endswith("]") or _v.startswith("{") and _v.endswith("}"):
-                                                values[i] = [_types[n](x) for n, x in enumerate(values[i][1:-1].split(iter_separator))]
-                                            else:
-                                                if self.raise_exceptions:
-                                                    raise ValueError(f"Invalid iterable syntax <{values[i]}>")
-                                                elif self.warnings:
-                                                    print(f"Warning: Invalid iterable syntax <{values[i]}> [returning]")
-                                                
-                                                return values
-                                        except ValueError as err:
-                                            if self.raise_exceptions:
-                                                raise TypeListError("Couldn't cast {} to {} due an error... {}".format(values[i], [t.__name__ for t in _types], err))
-                                            elif self.warnings:
-                                                print("Warning: Couldn't cast {} to {} due an error... {}".format(values[i], [t.__name__ for t in _types], err))
-                                                
-                                            continue
-                                    except IndexError:
-                                        if self.raise_exceptions:
-                                            raise TypeListError("Couldn't cast {} to {} because the type list was invalid".format(values[i], type(types[i]).__name__))
-                                        elif self.warnings:
-                                            print("Warning: Couldn't cast {} to {} because the type list was invalid".format(values[i], type(types[i]).__name__))
-
-                        except TypeError: # not iterable
-                            try:
-                                if isinstance(types[i], type):
-                                    values[i] = types[i](values[i])
-                            except ValueError:
-                                if self.raise_exceptions:
-                                    raise ValueCastError(f"Couldn't cast the value ({values[i]}) to {types[i].__name__}")
-                                elif self.warnings:
-                                    print(f"Warning: Couldn't cast the value ({values[i]}) to {types[i].__name__}")
-                                    
-                            skip_checks = False
-                            continue
-                            
-                    except TypeError:
-                        if self.raise_exceptions:
-                            raise TypeListError("Couldn't cast the value ({}) to {}".format(values[i], type(types[i]).__name__))
-                        elif self.warnings:
-                            print("Warning: Couldn't cast the value ({}) to {}".format(values[i], type(types[i]).__name__))
-                            
-                        continue
-                    
-                    if not isinstance(types[i], type) and not skip_checks:
-                        if self.raise_exceptions:
-                            raise ValueCastError(f"Couldn't cast the value ({values[i]}) because the type ({types[i]}) was not valid")
-                        elif self.warnings:
-                            print(f"Warning Couldn't cast the value ({values[i]}) because the type ({types[i]}) was not valid")
-                            
-                    elif isinstance(values[i], str) and types[i] != str and not skip_checks:
-                        if self.raise_exceptions:
-                            raise TypeListError("Couldn't cast the value ({}) to {}".format(values[i], types[i].__name__))
-                        elif self.warnings:
-                            print("Warning: Couldn't cast the value ({}) to {}".format(values[i], types[i].__name__))
-            else:
-                try:
-                    values = list(map(types[0], values))
-                except ValueError:
-                    if self.raise_exceptions:
-                        raise ValueCastError("Couldn't cast the value because the type was not valid")
-                    elif self.warnings:
-                        print("Warning: Couldn't cast the value because the type was not valid")
-        
-        return values
-
-    def get_input(self, text: str = default_kit["text"], cast_type: type = str, includes_spaces: bool = True, input_streamsize: int = None):
-        """This function get a single input value from keyboard
-            
-            The input value can be casted to the given type `cast_type` (default `str`)
-            
-            NOTE: PLEASE, TO READ AN ITERABLE USE `get_multiple_input` INSTEAD!
-            
-            params:
-                `text`:str, default: `""` -> the text of the input function
-                
-                `cast_type`:type, default: `str` -> the type to cast the value to
-                
-                `input_streamsize`:int, default: `None` -> substitute property self.streamsize without changing its value (value can be higher than self.streamsize)
-                
-            returns:
-                `value`:cast_type -> This list contains the elaborated data insert in input
-                
-            ~ If self.warnings is set on True, the function will show you any warnings/errors ~
-            
-            ~ If self.raise_exceptions is set on True, the function will raise exceptions if needed ~
-        """
-        if not self.__check_kit(): # if there's an error in the kit, replaces it with the default kit
-            self.kit = InputDevice.default_kit
-        
-        text = text if isinstance(text, str) else self.kit["text"]
-        if not input_streamsize:
-            input_streamsize = self.streamsize
-        elif input_streamsize == -1:
-            input_streamsize = None
-        elif input_streamsize < 1:
-            input_streamsize = self.streamsize
-        
-        try:
-            value = input(text)[0:input_streamsize if input_streamsize else None]
-
-            if not includes_spaces:
-                fs: int = value.find(" ")
-                value: str = value[0:fs if fs != -1 else None]
-            
-            return cast_type(value)
-        except ValueError:
-            if self.raise_exceptions:
-                raise ValueCastError(f"Couldn't cast the value ({value}) to {cast_type.__name__}")
-            elif self.warnings:
-                print(f"Warning: Couldn't cast the value ({value}) to {cast_type.__name__}")
-            
-            return value
-
-    def get_multiple_input(self, types:list[type]=[str], text:str=default_kit["text"], separator:str=default_kit["separator"], iter_separator:str=default_kit["iter_separator"], input_streamsize:int=None) -> list:
-        """This function gets multiple inputs in a single line, separated by a separator (default is `" "`)
-            
-            Then the inputs are casted to the type we put at the same position into `types`
-            
-            params:
-                `types`:list[Any], default:[str] -> this list contains the types to cast the values to
-                
-                `text`:str, default:`""` -> the text of the input function
-                
-                `separator`:str, default:`" "` -> this string is used to split the input values
-                
-                `input_streamsize`:int, default: None -> substitute property self.streamsize without changing its value (value can be higher than self.streamsize)
-                
-            returns:
-                `values`:list -> This list contains the elaborated data insert in input
-                
-            ~ If self.warnings is set on True, the function will show you any warnings/errors ~
-            
-            ~ If self.raise_exceptions is set on True, the function will raise exceptions if needed ~
-        """
-        if not self.__check_kit(): # if there's an error in the kit, replaces it with the default kit
-            self.kit: dict[str, str] = InputDevice.default_kit
-        
-        text = text if isinstance(text, str) else self.kit["text"]
-        separator = separator if isinstance(separator, str) and separator else self.kit["separator"]
-        iter_separator = iter_separator if isinstance(iter_separator, str) and iter_separator else self.kit["iter_separator"]
-        
-        if separator == iter_separator:
-            if self.raise_exceptions:
-                raise WrongArgumentError(f"Items separator ({separator}) and iter_separator ({iter_separator}) cannot be equal")
-            elif self.warnings:
-                print(f"Items separator ({separator}) and iter_separator ({iter_separator}) cannot be equal")
-                return
-        
-        if not input_streamsize or input_streamsize < 1:
-            input_streamsize = self.streamsize
-        elif input_streamsize == -1:
-            input_streamsize = None
-                
-        values:list[str] = input(text).split(separator)[0:input_streamsize if input_streamsize else None] # gets the input from index 0 to input_streamsize, if input_streamsize is None gets all the values from 0 to self.streamsize (if None gets all the values)
-        types = types[0:input_streamsize if input_streamsize else None]
-        
-        return self.process_data(values, types, iter_separator, input_streamsize)
+# Betterinput library
+# Author: Gex97
+
+__version__ = "0.3.5"
+__author__  = "Gex97"
+
+import io
+import os
+import sys
+import time
+import queue
+import threading
+import array
+import codecs
+import collections
+from typing import Any, AsyncIterator, Callable, Iterator, final
+
+
+from libexceptions import *
+from libparser import ParserPlan, CONVERTERS, DEFAULT_REGISTRY, SYNTAX_ERROR, spec_key, split_fields, with_memos, SPECIAL_CHARS, _tokenize
+from libstats import InputStats, type_name
+
+# numpy, asyncio, mmap and concurrent.futures are imported by the functions using them, `import betterinput` stays cheap
+_numpy_module: Any = False # see _numpy()
+
+def _numpy() -> Any:
+    """ Returns the numpy module, imported on the first call (None if it's not installed, array modes fall back to lists) """
+    global _numpy_module
+    if _numpy_module is False:
+        try:
+            import numpy as _numpy_module
+        except ImportError:
+            _numpy_module = None
+    return _numpy_module
+
+def _iter_lines(source: Any, chunksize: int = 1 << 16) -> Iterator[str]:
+    """Yields the lines of a file object reading it in chunks of `chunksize` (only the last partial line is kept in memory)
+
+        Text files are read through the text layer, so the data already buffered by previous reads (e.g. get_input on sys.stdin) is not lost
+
+        A chunk read never waits for more data than the stream already has: binary streams are read with read1,
+        text pipes and terminals are read line by line (a full chunk would wait for 64K chars or the end of the stream)
+    """
+    if isinstance(source, io.TextIOBase):
+        try:
+            seekable = source.seekable()
+        except (ValueError, OSError):
+            seekable = False
+
+        if not seekable:
+            for line in iter(source.readline, ""):
+                if line.endswith("\n"):
+                    line = line[:-2] if line.endswith("\r\n") else line[:-1]
+                elif line.endswith("\r"):
+                    line = line[:-1]
+                yield line
+            return
+
+    read = getattr(source, "read1", source.read)
+    decoder = None
+    rest = ""
+
+    while True:
+        chunk = read(chunksize)
+        if not chunk:
+            break
+
+        if not isinstance(chunk, str):
+            if decoder is None:
+                decoder = codecs.getincrementaldecoder(getattr(source, "encoding", None) or "utf-8")()
+            chunk = decoder.decode(chunk)
+
+        lines = chunk.split("\n")
+        lines[0] = rest + lines[0]
+        rest = lines.pop()
+
+        for line in lines:
+            yield line[:-1] if line.endswith("\r") else line
+
+    if decoder is not None:
+        rest += decoder.decode(b"", final=True)
+    if rest:
+        yield rest[:-1] if rest.endswith("\r") else rest
+
+def _byte_searchable(encoding: str, separator: str) -> bool:
+    """ Returns True if "\n" and `separator` can be searched as bytes in a file of `encoding` (they can't be part of another char) """
+    try:
+        if codecs.lookup(encoding).name in ("utf-8", "utf-8-sig"):
+            return True
+        # single byte encodings: every byte is a char and the ascii chars keep their byte
+        return "\n".encode(encoding) == b"\n" and len(separator.encode(encoding)) == len(separator) and len(bytes(range(256)).decode(encoding, "replace")) == 256
+    except (LookupError, UnicodeError):
+        return False
+
+def _parse_batch(types: list, separator: str, iter_separator: str, streamsize: int, registry: dict, lines: list[str], offset: int) -> tuple[list, list]:
+    """ Casts a chunk of lines (runs in the worker processes of process_batch), the errors are returned as (line, error, message, spec) """
+    device = InputDevice()
+    device._set_registry(registry)
+    plan = device.compile(types, separator, iter_separator, streamsize) # plans are cached in every worker
+    errors: list = []
+    records: list = []
+    parse = plan.parse
+    split = plan.split
+    line_number = offset
+
+    def report(error: type, message: str, spec: Any = None):
+        errors.append((line_number, error, message, spec))
+
+    for line in lines:
+        records.append(parse(split(line), report))
+        line_number += 1
+
+    return records, errors
+
+_EOF = object() # end of the stream in the prefetch queues
+_NESTED = object() # first item of the plans cache keys of the nested specs (flat keys start with the separator)
+
+class Prefetcher:
+    """Iterator returned by InputDevice.prefetch: a reader thread reads the lines ahead into a bounded queue
+
+        The records are parsed by the consumer (inline) or by a second thread (`parse_thread=True`)\n
+        Use it as a context manager (or call close()) to stop the threads before the end of the stream
+    """
+    def __init__(self, device: "InputDevice", plan: ParserPlan, source: Any, depth: int, skip_empty: bool, parse_thread: bool):
+        self.device = device
+        self.plan = plan
+        self.source = source
+        self.skip_empty = skip_empty
+        self._stop = threading.Event()
+        self._lines: queue.Queue = queue.Queue(maxsize=depth)
+        self._records: queue.Queue = queue.Queue(maxsize=depth) if parse_thread else None
+        self._threads: list[threading.Thread] = [threading.Thread(target=self._read, name="betterinput-reader", daemon=True)]
+        if parse_thread:
+            self._threads.append(threading.Thread(target=self._parse, name="betterinput-parser", daemon=True))
+        
+        for thread in self._threads:
+            thread.start()
+
+    def _put(self, q: queue.Queue, item: Any) -> bool:
+        """ Waits for a free slot in the queue (backpressure), returns False if the prefetcher was closed """
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _read(self):
+        try:
+            readline = self.source.readline
+            while not self._stop.is_set():
+                line = readline()
+                if not line:
+                    break
+                
+                line = line[:-2] if line.endswith("\r\n") else line[:-1] if line.endswith("\n") else line
+                if line or not self.skip_empty:
+                    if not self._put(self._lines, line):
+                        return
+        except BaseException as err: # given to the consumer
+            self._put(self._lines, err)
+            return
+        
+        self._put(self._lines, _EOF)
+
+    def _parse(self):
+        parse = self.plan.parse
+        split = self.plan.split
+        try:
+            while True:
+                line = self._get(self._lines)
+                if line is _EOF or isinstance(line, BaseException):
+                    self._put(self._records, line)
+                    return
+                
+                errors: list = [] # reported by the consumer, following the device policy
+                values = parse(split(line), lambda error, message, spec=None: errors.append((error, message, spec)))
+                if not self._put(self._records, (values, errors)):
+                    return
+        except BaseException as err: # e.g. a custom converter raising an unexpected error, given to the consumer
+            self._put(self._records, err)
+
+    def _get(self, q: queue.Queue) -> Any:
+        while True:
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                if self._stop.is_set():
+                    return _EOF
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> list:
+        item = self._get(self._lines if self._records is None else self._records)
+        if item is _EOF:
+            self.close()
+            raise StopIteration
+        
+        if isinstance(item, BaseException):
+            self.close()
+            raise item
+        
+        device = self.device
+        if self._records is None:
+            if device._stats is None:
+                return self.plan.parse(self.plan.split(item), device._report)
+            return device._timed_line(self.plan, item)
+        
+        values, errors = item
+        if device._stats is not None: # cast by the parser thread, only the record is counted
+            device._stats.record(values, len(values))
+        for error, message, spec in errors:
+            device._report(error, message, spec)
+        
+        return values
+
+    def close(self):
+        """ Stops the threads (a reader blocked on an interactive input stops after the next line) """
+        self._stop.set()
+        for q in (self._lines, self._records):
+            while q is not None: # frees the threads waiting on a full queue (the parser thread can empty it meanwhile)
+                try:
+                    q.get_nowait()
+                except queue.Empty:
+                    break
+        
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout=0.2)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+class _LineReader:
+    """Reads the lines of a blocking file object for the coroutines (sys.stdin by default)
+
+        A single daemon thread reads a line only when a coroutine is waiting and there's no line left in the buffer
+
+        The lines are kept in a buffer shared by every device and event loop until a coroutine takes them,
+        so a timeout or a closed loop never loses a line and the lines are given in order
+    """
+    def __init__(self, source: Any = None):
+        self.source = source
+        self._cond = threading.Condition()
+        self._lines: collections.deque = collections.deque() # (line, error) read and not taken yet
+        self._waiters: list = [] # (loop, future) of the waiting coroutines
+        self._thread: threading.Thread = None
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._waiters or self._lines:
+                    self._cond.wait()
+
+            line, error = None, None
+            try:
+                line = (sys.stdin if self.source is None else self.source).readline()
+            except BaseException as err: # given to the coroutine
+                error = err
+
+            with self._cond:
+                self._lines.append((line, error))
+                self._wake()
+
+    def _wake(self):
+        """ Wakes every waiting coroutine, they compete for the buffered lines (called holding the lock) """
+        waiters, self._waiters = self._waiters, []
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(_wake_up, future)
+            except RuntimeError: # the loop is closed, the line stays in the buffer
+                pass
+
+    async def readline(self) -> str:
+        """ Returns the next line ("" at the end of the stream) """
+        import asyncio
+        
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._cond:
+                if self._lines:
+                    line, error = self._lines.popleft()
+                    if self._lines and self._waiters: # a woken coroutine was cancelled before taking its line
+                        self._wake()
+                    self._cond.notify()
+                    if error is not None:
+                        raise error
+                    return line
+
+                waiter = (loop, loop.create_future())
+                self._waiters.append(waiter)
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="betterinput-stdin", daemon=True)
+                    self._thread.start()
+                self._cond.notify()
+
+            try:
+                await waiter[1]
+            finally:
+                with self._cond:
+                    if waiter in self._waiters: # cancelled before a line came
+                        self._waiters.remove(waiter)
+                    elif self._lines and self._waiters: # woken and cancelled: the line goes to another coroutine
+                        self._wake()
+
+def _wake_up(future: Any):
+    if not future.done():
+        future.set_result(None)
+
+_STDIN = _LineReader() # stdin is shared by the whole process, so its reader is too
+
+class InputDevice:
+    """Input device that improves input operations.
+    
+        constructor:
+            params:
+                `warnings`       : bool #private property
+                `raise_exception`: bool #private property
+                `streamsize`     : int  #private property
+                `kit`            : dict #private
+                
+        use set_attribute(attr, value) to change their value\n
+        The private properties are read-only: a direct assignment raises AttributeError
+    """
+
+    default_kit: dict[str, str] = {
+        "separator": " ",
+        "iter_separator":",",
+        "text": ""
+    }
+
+    max_cached_plans: int = 256
+    array_typecodes: dict[type, str] = {int: "q", float: "d"} # array.array storage of get_matrix
+    read_chunksize: int = 4096 # chars read at once when a streamsize limits the input
+    _plans: dict = {} # compiled plans shared by every device, see compile()
+
+    __slots__ = ("_warnings", "_raise_exceptions", "_streamsize", "kit", "_stats", "_registry", "_registry_key")
+
+    def __init__(self, warnings:bool=False, raise_exceptions:bool=False, streamsize:int=None, kit:dict=default_kit):
+        self._set_warnings(warnings)
+        self._set_raise_exceptions(raise_exceptions)
+        self._set_streamsize(streamsize)
+        self.kit = kit
+        self._stats = None # InputStats, see enable_stats()
+        self._registry = DEFAULT_REGISTRY # type -> (converter, memo size), see register_converter()
+        self._registry_key = () # part of the plans cache key, () for the default registry
+        if not self.__check_kit():
+            self.kit = InputDevice.default_kit
+    
+    @property
+    def streamsize(self):
+        return self._streamsize
+    
+    def _set_streamsize(self, size:int):
+        """ streamsize setter, use set_attribute("streamsize", value: int) to change its value """
+        if isinstance(size, int):
+            self._streamsize = size if size > 0 else None
+        elif size is None:
+            self._streamsize = None
+        else:
+            raise TypeError(f"Invalid value type for \"streamsize\" expected int or None, found {type(size).__name__}")
+    
+    @property
+    def warnings(self):
+        return self._warnings
+    
+    def _set_warnings(self, state:bool):
+        """ warnings setter, use set_attribute("warnings", value: bool) to change its value """
+        if isinstance(state, bool):
+            self._warnings = state
+        else:
+            raise TypeError(f"Invalid value type for \"warnings\" expected bool, found {type(state).__name__}")
+    
+    @property
+    def raise_exceptions(self):
+        return self._raise_exceptions
+    
+    def _set_raise_exceptions(self, state:bool):
+        """ raise_exceptions setter, use set_attribute("raise_exceptions", value: bool) to change its value """
+        if isinstance(state, bool):
+            self._raise_exceptions = state
+        else:
+            raise TypeError(f"Invalid value type for \"raise_exception\" expected bool, found {type(state).__name__}")
+    
+    _setters: dict = {
+        "streamsize": _set_streamsize,
+        "warnings": _set_warnings,
+        "raise_exceptions": _set_raise_exceptions
+    }
+    
+    @final
+    def set_attribute(self, attr, value):
+        if attr and value is not None:
+            setter = InputDevice._setters.get(attr)
+            if setter is not None:
+                setter(self, value)
+            elif hasattr(self, attr):
+                try:
+                    self.__setattr__(attr, value)
+                except AttributeError:
+                    return
+            else:
+                raise AttributeError(f"Attribute: {attr} not found")
+        else:
+            raise WrongArgumentError("Invalid arguments: {}, {}".format(attr, value))
+
+    @property
+    def stats(self) -> InputStats:
+        """ The InputStats of the device, None if they are disabled """
+        return self._stats
+
+    def enable_stats(self) -> InputStats:
+        """This function enables the counters, the stage timings and the hooks of the device
+
+            Every entry point (sync, async, streaming, get_matrix, process_batch and prefetch) counts its records and failures,
+            the stages that run in other processes or threads (process_batch workers, prefetch reader and parser threads) are not timed
+
+            returns:
+                `stats`:InputStats -> use stats.snapshot() to export them, stats.reset() to clear them and stats.add_hook(event, callback) to be notified
+        """
+        if self._stats is None:
+            self._stats = InputStats(self.memo_info)
+        
+        return self._stats
+
+    def disable_stats(self):
+        """ Disables the stats, when disabled they cost a single check for every call """
+        self._stats = None
+
+    def __check_kit(self):
+        if len(self.kit) == len(InputDevice.default_kit):
+            for item in list(self.kit.keys()):
+                try:
+                    if not self.kit[item] or type(self.kit[item]).__name__ != type(InputDevice.default_kit[item]).__name__:
+                        return False
+                except KeyError:
+                    return False
+
+            return True
+
+        return False
+
+    def _report(self, error: type, message: str, spec: Any = None):
+        """ Raises `error` or shows `message` as a warning, following self.raise_exceptions and self.warnings """
+        if self._stats is not None:
+            self._stats.failure(spec, error, message)
+        
+        if self.raise_exceptions:
+            raise error(message)
+        elif self.warnings:
+            print(f"Warning: {message}")
+
+    def compile(self, types: list[type] = [str], separator: str = default_kit["separator"], iter_separator: str = default_kit["iter_separator"], streamsize: int = None) -> ParserPlan:
+        """This function checks and classifies a type list once and returns a reusable parser plan
+            
+            The plan can be passed as `types` to `process_data` and `get_multiple_input`
+            
+            params:
+                `types`:list, default:[str] -> this list contains the types to cast the values to
+                
+                `separator`:str, default:`" "` -> this string is used to split the input values
+                
+                `iter_separator`:str, default:`","` -> this string is used to split the items of an iterable value
+                
+                `streamsize`:int, default: None -> max number of values (and types) the plan handles
+                
+            returns:
+                `plan`:ParserPlan -> the compiled plan, plans are cached by spec
+        """
+        if type(types) is ParserPlan:
+            return types
+
+        try: # flat specs are keyed by the types themselves (no spec_key to build), a cached plan costs a single lookup
+            key = (separator, iter_separator, streamsize, self._registry_key, *types)
+            plan = InputDevice._plans.get(key)
+            if plan is not None:
+                return plan
+        except TypeError: # a list in the spec (or not a list at all)
+            key = None
+
+        if type(types) not in (list, tuple):
+            raise TypeListError("Couldn't compile types: parameter \"types\" should be of type list or tuple, not {}".format(type(types).__name__))
+
+        if key is None:
+            try:
+                key = (_NESTED, spec_key(types), separator, iter_separator, streamsize, self._registry_key)
+                plan = InputDevice._plans.get(key)
+            except TypeError: # unhashable type in the spec, the plan is not cached
+                return ParserPlan(types, separator, iter_separator, streamsize, self._registry)
+
+        if plan is None:
+            if len(InputDevice._plans) >= InputDevice.max_cached_plans:
+                InputDevice._plans.clear()
+
+            plan = InputDevice._plans[key] = ParserPlan(types, separator, iter_separator, streamsize, self._registry)
+
+        return plan
+
+    def register_converter(self, spec: type, converter: Callable = None, memo: int = 0):
+        """This function sets the converter used to cast the values of type `spec` (instead of calling `spec(value)`)
+            
+            Built-in converters: int, float, bool (`"false"`, `"no"`, `"0"`... -> False), complex, bytes
+            
+            params:
+                `spec`:type -> the type the converter is used for
+                
+                `converter`:callable, default: None -> gets the token and returns the value (None keeps the current converter)
+                
+                `memo`:int, default: 0 -> size of an LRU memo of this type, repeated tokens are not cast again
+                                         (the same object is returned for the same token, use it only for immutable values)
+
+                                         The memo belongs to the device: all its fields and plans of this type share it, other devices have their own
+                                         (see memo_info and stats.snapshot() for the hit rates)
+                
+            NOTE: process_batch sends the converters to other processes, so they must be picklable there
+        """
+        if converter is not None and not callable(converter):
+            raise WrongArgumentError(f"Invalid converter for {getattr(spec, '__name__', spec)}: {converter} is not callable")
+        if not isinstance(memo, int) or memo < 0:
+            raise WrongArgumentError(f"Invalid memo size: {memo}")
+        
+        registry = dict(self._registry)
+        current, current_memo = registry.get(spec, (CONVERTERS.get(spec, spec), 0))
+        if current_memo: # the converter inside the current memo
+            current = current.__wrapped__
+        registry[spec] = (converter or current, memo)
+        self._set_registry(registry)
+
+    def unregister_converter(self, spec: type):
+        """ Restores the built-in converter of `spec` (or the type itself if there's no built-in converter) """
+        registry = dict(self._registry)
+        registry.pop(spec, None)
+        if spec in DEFAULT_REGISTRY:
+            registry[spec] = DEFAULT_REGISTRY[spec]
+        self._set_registry(registry)
+
+    def _set_registry(self, registry: dict):
+        self._registry = registry = with_memos(registry) # the memos are part of the key, so the plans of other devices don't share them
+        self._registry_key = () if registry == DEFAULT_REGISTRY else tuple(registry.items())
+
+    def memo_info(self) -> dict[str, Any]:
+        """ Returns the hits/misses (functools CacheInfo) of the memo of every type registered with a `memo` size """
+        return {type_name(spec): convert.cache_info() for spec, (convert, memo) in self._registry.items() if memo}
+
+    def _line_plan(self, types: list, separator: str, iter_separator: str, input_streamsize: int) -> ParserPlan:
+        """ Checks the separators and the streamsize of a line reader and returns its plan (None if the separators are not valid) """
+        if not self.__check_kit(): # if there's an error in the kit, replaces it with the default kit
+            self.kit: dict[str, str] = InputDevice.default_kit
+        
+        separator = separator if isinstance(separator, str) and separator else self.kit["separator"]
+        iter_separator = iter_separator if isinstance(iter_separator, str) and iter_separator else self.kit["iter_separator"]
+        
+        if separator == iter_separator:
+            self._report(WrongArgumentError, f"Items separator ({separator}) and iter_separator ({iter_separator}) cannot be equal")
+            return None
+        
+        if not input_streamsize or input_streamsize < 1:
+            input_streamsize = self.streamsize
+        
+        return self.compile(types, separator, iter_separator, input_streamsize) # cached, the types are checked only the first time
+
+    def process_data(self, values:list=None, types:list[type]=[str], iter_separator: str = ",", input_streamsize:int=None, validate:bool=False):
+        """This function gets a list containing some values
+            
+            Then the inputs are casted to the type we put at the same position into `types`
+            
+            params:
+                `values`:list, default:None -> this list contains the values to process
+                
+                `types`:list, default:[str] -> this list contains the types to cast the values to (or a plan returned by `compile`)
+                
+                `input_streamsize`:int, default: None -> substitute property self.streamsize without changing its value (value can be higher than self.streamsize)
+                
+                `validate`:bool, default: False -> returns a ParseResult with the error code of every value, cast errors are not reported
+                
+            returns:
+                `values`:list -> This list contains the elaborated data insert in input
+                
+            ~ If self.warnings is set on True, the function will show you any warnings/errors ~
+            
+            ~ If self.raise_exceptions is set on True, the function will raise exceptions if needed ~
+        """
+        if type(values) not in (list, tuple):
+            if self.raise_exceptions:
+                raise TypeListError("Couldn't cast values: parameter \"values\" should be of type list or tuple, not {}".format(type(values).__name__))
+            elif self.warnings:
+                print("Warning: Couldn't cast values: parameter \"values\" should be of type list or tuple, not {}".format(type(values).__name__))
+        
+        if not input_streamsize:
+            input_streamsize = self._streamsize
+        elif input_streamsize == -1:
+            input_streamsize = None
+        elif input_streamsize < 1:
+            input_streamsize = self._streamsize
+        
+        values:list[str] = values[0:input_streamsize if input_streamsize else None] # gets the input from index 0 to input_streamsize, if input_streamsize is None gets all the values from 0 to self.streamsize (if None gets all the values)
+        
+        if type(types) not in (list, tuple, ParserPlan):
+            if self.raise_exceptions:
+                raise TypeListError("Couldn't cast values: parameter \"types\" should be of type  list or tuple, not {}".format(type(types).__name__))
+            elif self.warnings:
+                print("Warning: Couldn't cast values: parameter \"types\" should be of type list or tuple, not {}".format(type(types).__name__))
+            
+            return values
+
+        plan = self.compile(types, self.kit["separator"], iter_separator)
+        
+        if self._stats is None:
+            return plan.validate(values) if validate else plan.parse(values, self._report)
+        
+        return self._timed_cast(plan, values, validate=validate)
+
+    def _cast(self, plan: ParserPlan, values: list[str], as_array: bool = False, validate: bool = False):
+        """ Casts the tokens of a line with `plan`, returns the values list (a numpy array if `as_array`, a ParseResult if `validate`) """
+        if as_array:
+            return self._to_array(plan, values)
+        
+        if validate:
+            return plan.validate(values)
+        
+        return plan.parse(values, self._report)
+
+    def _timed_cast(self, plan: ParserPlan, values: list[str], as_array: bool = False, validate: bool = False):
+        """ _cast with the stats enabled: times the cast and counts the record """
+        stats = self._stats
+        tokens = len(values)
+        start = time.perf_counter_ns()
+        result = self._cast(plan, values, as_array, validate)
+        stats.timing("cast", time.perf_counter_ns() - start)
+        
+        if validate:
+            fields = plan.fields
+            for i, code in result.errors: # validate doesn't report the errors
+                stats.failure(fields[i if len(fields) > 1 else 0].spec, TypeListError if code == SYNTAX_ERROR else ValueCastError, f"error code {code} at value {i}")
+        
+        stats.record(result, tokens)
+        return result
+
+    def _timed_line(self, plan: ParserPlan, line: str, start: int = None, as_array: bool = False, validate: bool = False):
+        """ _timed_cast of a raw line: times the read (since `start`, None if the line wasn't read by the device) and the split too """
+        stats = self._stats
+        split = time.perf_counter_ns()
+        if start is not None:
+            stats.timing("read", split - start)
+        values = plan.split(line)
+        stats.timing("split", time.perf_counter_ns() - split)
+        
+        return self._timed_cast(plan, values, as_array, validate)
+
+    def _timed_cast_input(self, value: str, start: int, cast_type: type, includes_spaces: bool, input_streamsize: int):
+        """ _cast_input with the stats enabled: times the read (since `start`) and the cast and counts the record """
+        stats = self._stats
+        read = time.perf_counter_ns()
+        stats.timing("read", read - start)
+        value = self._cast_input(value, cast_type, includes_spaces, input_streamsize)
+        stats.timing("cast", time.perf_counter_ns() - read)
+        stats.record(value, 1)
+        
+        return value
+
+    def _read_values(self, text: str, plan: ParserPlan) -> list[str]:
+        """ Reads a line and splits it with `plan`, both the stages are timed when the stats are enabled """
+        if self._stats is None:
+            return plan.split(self._input(text, plan=plan))
+        
+        start = time.perf_counter_ns()
+        line = self._input(text, plan=plan)
+        read = time.perf_counter_ns()
+        self._stats.timing("read", read - start)
+        values = plan.split(line)
+        self._stats.timing("split", time.perf_counter_ns() - read)
+        
+        return values
+
+    def _input(self, text: str, max_chars: int = None, plan: ParserPlan = None) -> str:
+        """Builtin input() that reads only the part of the line that is used
+
+            At most `max_chars` chars are read, or only the first `plan.streamsize` values of the line,
+            then the rest of the line is skipped in chunks (it's never kept in memory)
+        """
+        limit = plan.streamsize if plan is not None else None
+        if not max_chars and not limit:
+            return input(text)
+        
+        if text:
+            sys.stdout.write(text)
+            sys.stdout.flush()
+        
+        stdin = sys.stdin
+        if max_chars:
+            line = stdin.readline(max_chars)
+        else:
+            # reads bigger and bigger chunks until the first `limit` values are complete (the values after them are not needed)
+            size = InputDevice.read_chunksize
+            line = stdin.readline(size)
+            while line and not line.endswith("\n"):
+                fields, stopped = _tokenize(line, plan.separator, limit, plan.iter_separator)
+                if stopped or fields is None and line.count(plan.separator) >= limit:
+                    break # with an unclosed quote or bracket the line is split with str.split, like split_fields does
+                size *= 2
+                chunk = stdin.readline(size)
+                if not chunk:
+                    break
+                line += chunk
+        
+        if not line:
+            raise EOFError("EOF when reading a line")
+        
+        if line.endswith("\n"):
+            return line[:-2] if line.endswith("\r\n") else line[:-1]
+        
+        while True: # skips the rest of the line
+            chunk = stdin.readline(InputDevice.read_chunksize)
+            if not chunk or chunk.endswith("\n"):
+                break
+        
+        return line
+
+    def get_input(self, text: str = default_kit["text"], cast_type: type = str, includes_spaces: bool = True, input_streamsize: int = None):
+        """This function get a single input value from keyboard
+            
+            The input value can be casted to the given type `cast_type` (default `str`)
+            
+            NOTE: PLEASE, TO READ AN ITERABLE USE `get_multiple_input` INSTEAD!
+            
+            params:
+                `text`:str, default: `""` -> the text of the input function
+                
+                `cast_type`:type, default: `str` -> the type to cast the value to
+                
+                `input_streamsize`:int, default: `None` -> substitute property self.streamsize without changing its value (value can be higher than self.streamsize)
+                
+            returns:
+                `value`:cast_type -> This list contains the elaborated data insert in input
+                
+            ~ If self.warnings is set on True, the function will show you any warnings/errors ~
+            
+            ~ If self.raise_exceptions is set on True, the function will raise exceptions if needed ~
+        """
+        if not self.__check_kit(): # if there's an error in the kit, replaces it with the default kit
+            self.kit = InputDevice.default_kit
+        
+        text = text if isinstance(text, str) else self.kit["text"]
+        input_streamsize = self._chars_streamsize(input_streamsize)
+        
+        stats = self._stats
+        if stats is None:
+            return self._cast_input(self._input(text, input_streamsize), cast_type, includes_spaces, input_streamsize)
+        
+        start = time.perf_counter_ns()
+        return self._timed_cast_input(self._input(text, input_streamsize), start, cast_type, includes_spaces, input_streamsize)
+
+    def _chars_streamsize(self, input_streamsize: int) -> int:
+        """ Returns the max number of chars read by get_input (None: the whole line) """
+        if not input_streamsize:
+            input_streamsize = self.streamsize
+        elif input_streamsize == -1:
+            input_streamsize = None
+        elif input_streamsize < 1:
+            input_streamsize = self.streamsize
+        
+        return input_streamsize
+
+    def _cast_input(self, value: str, cast_type: type, includes_spaces: bool, input_streamsize: int):
+        """ Truncates (`input_streamsize` already resolved by _chars_streamsize) and casts a single input value with the registered converters (see get_input) """
+        value = value[0:input_streamsize if input_streamsize else None]
+
+        if not includes_spaces:
+            fs: int = value.find(" ")
+            value: str = value[0:fs if fs != -1 else None]
+        
+        # the plan is cached, a wrong value is reported and returned as it is
+        return self.compile([cast_type], iter_separator=self.kit["iter_separator"]).parse([value], self._report)[0]
+
+    def get_multiple_input(self, types:list[type]=[str], text:str=default_kit["text"], separator:str=default_kit["separator"], iter_separator:str=default_kit["iter_separator"], input_streamsize:int=None, as_array:bool=False, validate:bool=False) -> list:
+        """This function gets multiple inputs in a single line, separated by a separator (default is `" "`)
+            
+            Then the inputs are casted to the type we put at the same position into `types`
+            
+            params:
+                `types`:list[Any], default:[str] -> this list contains the types to cast the values to (or a plan returned by `compile`)
+                
+                `text`:str, default:`""` -> the text of the input function
+                
+                `separator`:str, default:`" "` -> this string is used to split the input values
+                
+                `input_streamsize`:int, default: None -> substitute property self.streamsize without changing its value (value can be higher than self.streamsize)
+                
+                `as_array`:bool, default: False -> returns a numpy array when all the types are the same numeric type (needs numpy, otherwise a list is returned), it can't be used with `validate`
+                
+                `validate`:bool, default: False -> returns a ParseResult with the error code of every value, cast errors are not reported
+                
+            returns:
+                `values`:list -> This list contains the elaborated data insert in input
+                
+            ~ If self.warnings is set on True, the function will show you any warnings/errors ~
+            
+            ~ If self.raise_exceptions is set on True, the function will raise exceptions if needed ~
+        """
+        if as_array and validate:
+            raise WrongArgumentError("Couldn't read the input: as_array and validate can't be used together")
+        
+        plan = self._line_plan(types, separator, iter_separator, input_streamsize)
+        if plan is None:
+            return
+        
+        text = text if isinstance(text, str) else self.kit["text"]
+        
+        stats = self._stats
+        if stats is None:
+            values:list[str] = plan.split(self._input(text, plan=plan)) # gets the input from index 0 to input_streamsize, if input_streamsize is None gets all the values
+            return self._cast(plan, values, as_array, validate)
+        
+        start = time.perf_counter_ns()
+        return self._timed_line(plan, self._input(text, plan=plan), start, as_array, validate)
+
+    def get_matrix(self, rows:int, types:list[type]=[str], text:str=default_kit["text"], separator:str=default_kit["separator"], iter_separator:str=default_kit["iter_separator"], input_streamsize:int=None, storage:str="list", column_major:bool=False):
+        """This function reads `rows` lines of values into a preallocated matrix
+            
+            The number of columns is the length of `types` (or of the first line when `types` contains a single type), every line must have the same number of values
+            
+            params:
+                `rows`:int -> number of lines to read
+                
+                `types`:list[Any], default:[str] -> this list contains the types to cast the values to (or a plan returned by `compile`)
+                
+                `text`:str, default:`""` -> the text of the input function (shown before the first line)
+                
+                `separator`:str, default:`" "` -> this string is used to split the input values
+                
+                `input_streamsize`:int, default: None -> substitute property self.streamsize without changing its value
+                
+                `storage`:str, default: `"list"` -> `"list"`: list of lists
+                                                   `"array"`: list of array.array columns (int or float values only)
+                                                   `"numpy"`: 2D numpy array (numeric values only, a list of lists is returned without numpy)
+                
+                `column_major`:bool, default: False -> the matrix contains the columns instead of the rows (`"array"` storage is always column major)
+                
+            returns:
+                `matrix`:list | numpy.ndarray -> the elaborated data (a wrong value is kept as it is in a list, it's 0 in an array)
+                
+            ~ If self.warnings is set on True, the function will show you any warnings/errors ~
+            
+            ~ If self.raise_exceptions is set on True, the function will raise exceptions if needed ~
+        """
+        if not isinstance(rows, int) or rows < 0:
+            raise WrongArgumentError(f"Invalid number of rows: {rows}")
+        if storage not in ("list", "array", "numpy"):
+            raise WrongArgumentError(f"Invalid storage: {storage}, expected \"list\", \"array\" or \"numpy\"")
+        
+        plan = self._line_plan(types, separator, iter_separator, input_streamsize)
+        if plan is None:
+            return
+        
+        text = text if isinstance(text, str) else self.kit["text"]
+        field = plan.homogeneous
+        
+        np = _numpy() if storage == "numpy" else None
+        if storage != "list":
+            typecode = InputDevice.array_typecodes.get(field.spec) if field is not None and field.kind == "scalar" else None
+            if storage == "numpy" and np is None:
+                storage = "list"
+            elif storage == "array" and typecode is None or storage == "numpy" and self._numeric_dtype(field) is None:
+                self._report(WrongArgumentError, f"Couldn't use {storage} storage: all the values must have the same numeric type")
+                storage = "list"
+        
+        if rows == 0: # no line is read, the number of columns is the number of types
+            cols = len(plan.fields)
+            if storage == "numpy":
+                return np.empty((cols, 0) if column_major else (0, cols), self._numeric_dtype(field))
+            if storage == "array":
+                return [array.array(typecode) for _ in range(cols)]
+            return [[] for _ in range(cols)] if column_major else []
+        
+        cast = self._cast if self._stats is None else self._timed_cast
+        
+        # the first line gives the shape, then the storage is allocated once
+        values = self._read_values(text, plan)
+        cols = len(values) if len(plan.fields) == 1 else len(plan.fields)
+        
+        if storage == "numpy":
+            dtype = self._numeric_dtype(field)
+            matrix = np.zeros((cols, rows) if column_major else (rows, cols), dtype)
+        elif storage == "array":
+            matrix = [array.array(typecode, bytes(rows * array.array(typecode).itemsize)) for _ in range(cols)]
+        elif column_major:
+            matrix = [[None] * rows for _ in range(cols)]
+        else:
+            matrix = [None] * rows
+        
+        for r in range(rows):
+            if r:
+                values = self._read_values("", plan)
+            
+            if len(values) != cols:
+                self._report(TypeListError, f"Invalid number of values in row {r}: expected {cols}, got {len(values)}")
+                if storage == "list" and not column_major:
+                    matrix[r] = values
+                continue
+            
+            if storage == "numpy":
+                row = cast(plan, values, True)
+                try:
+                    if column_major:
+                        matrix[:, r] = row
+                    else:
+                        matrix[r] = row
+                except (ValueError, TypeError, OverflowError): # some value wasn't cast: the other values are stored one by one
+                    for c, value in enumerate(row):
+                        try:
+                            matrix[(c, r) if column_major else (r, c)] = value
+                        except (ValueError, TypeError): # not cast, already reported (the cell is left to 0)
+                            pass
+                        except OverflowError:
+                            self._report(ValueCastError, f"Couldn't store the value ({value}) in row {r}, column {c}", field.spec)
+                continue
+            
+            values = cast(plan, values)
+            if storage == "list" and not column_major:
+                matrix[r] = values
+                continue
+            
+            try:
+                for column, value in zip(matrix, values):
+                    column[r] = value
+            except (TypeError, OverflowError):
+                for c, value in enumerate(values):
+                    try:
+                        matrix[c][r] = value
+                    except TypeError: # not cast, already reported
+                        pass
+                    except OverflowError:
+                        self._report(ValueCastError, f"Couldn't store the value ({value}) in row {r}, column {c}", field.spec)
+        
+        return matrix
+
+    def _numeric_dtype(self, field):
+        """ Returns the numpy dtype of a homogeneous numeric field (None if it's not numeric or numpy is not installed) """
+        if field is None or field.kind != "scalar" or _numpy() is None:
+            return None
+        
+        try:
+            dtype = _numpy().dtype(field.spec)
+        except TypeError:
+            return None
+        
+        return dtype if dtype.kind in "iufc" else None
+
+    def read_array(self, dtype:type=float, text:str=default_kit["text"], separator:str=default_kit["separator"], input_streamsize:int=None):
+        """This function reads a line of numeric values of the same type into a numpy array
+            
+            The values are parsed by numpy in a single vectorized cast (no python object is built for each value)
+            
+            params:
+                `dtype`:type, default: `float` -> the numeric type of the values (python or numpy type)
+                
+                `text`:str, default:`""` -> the text of the input function
+                
+                `separator`:str, default:`" "` -> this string is used to split the input values
+                
+                `input_streamsize`:int, default: None -> substitute property self.streamsize without changing its value
+                
+            returns:
+                `values`:numpy.ndarray -> the elaborated data (a list if numpy is not installed or a value couldn't be cast)
+                
+            ~ If self.warnings is set on True, the function will show you any warnings/errors ~
+            
+            ~ If self.raise_exceptions is set on True, the function will raise exceptions if needed ~
+        """
+        return self.get_multiple_input([dtype], text, separator, input_streamsize=input_streamsize, as_array=True)
+
+    def _to_array(self, plan: ParserPlan, values: list[str]):
+        """ Casts homogeneous numeric tokens into a numpy array, falls back to plan.parse (and a list) when it's not possible """
+        field = plan.homogeneous
+        dtype = self._numeric_dtype(field) # only numbers are parsed by numpy
+        if dtype is None or len(plan.fields) not in (1, len(values)):
+            return plan.parse(values, self._report)
+        
+        np = _numpy()
+        # numpy parses the tokens only for the built-in converters, a registered converter is always called
+        if getattr(field.convert, "__wrapped__", field.convert) is CONVERTERS.get(field.spec, field.spec):
+            try:
+                return np.array(values).astype(dtype)
+            except (ValueError, TypeError, OverflowError):
+                pass
+        
+        # numpy couldn't parse some value: the python path reports the wrong values following the device policy
+        values = plan.parse(values, self._report)
+        try:
+            return np.array(values, dtype=dtype)
+        except (ValueError, TypeError, OverflowError):
+            pass
+        
+        for i, value in enumerate(values): # the values cast by python that don't fit the dtype (the tokens left as str are already reported)
+            if not isinstance(value, str):
+                try:
+                    np.array(value, dtype=dtype)
+                except (ValueError, TypeError, OverflowError):
+                    self._report(ValueCastError, f"Couldn't store the value ({value}) at index {i} in a {dtype} array", field.spec)
+        
+        return values
+
+    def iter_records(self, types:list[type]=[str], source:Any=None, separator:str=default_kit["separator"], iter_separator:str=default_kit["iter_separator"], input_streamsize:int=None, skip_empty:bool=True, chunksize:int=1 << 16) -> Iterator[list]:
+        """This function reads a stream line by line and yields every line casted like `get_multiple_input` does
+            
+            The stream is read in big chunks through its text layer, so only the current chunk is kept in memory and it can follow get_input on stdin
+            
+            params:
+                `types`:list[Any], default:[str] -> this list contains the types to cast the values to (or a plan returned by `compile`)
+                
+                `source`:file, default: sys.stdin -> the text or binary file object to read
+                
+                `separator`:str, default:`" "` -> this string is used to split the input values
+                
+                `input_streamsize`:int, default: None -> substitute property self.streamsize without changing its value
+                
+                `skip_empty`:bool, default: True -> empty lines are not yielded
+                
+                `chunksize`:int, default: 65536 -> the size of every read
+                
+            yields:
+                `values`:list -> the elaborated data of a single line
+                
+            ~ If self.warnings is set on True, the function will show you any warnings/errors ~
+            
+            ~ If self.raise_exceptions is set on True, the function will raise exceptions if needed ~
+        """
+        plan = self._line_plan(types, separator, iter_separator, input_streamsize)
+        if plan is None:
+            return
+        
+        parse = plan.parse
+        split = plan.split
+        report = self._report
+        
+        for line in _iter_lines(sys.stdin if source is None else source, chunksize):
+            if line or not skip_empty:
+                yield parse(split(line), report) if self._stats is None else self._timed_line(plan, line)
+
+    def from_file(self, path:str, types:list[type]=[str], separator:str=default_kit["separator"], iter_separator:str=default_kit["iter_separator"], input_streamsize:int=None, skip_empty:bool=True, encoding:str="utf-8") -> Iterator[list]:
+        """This function memory-maps a file and yields every line casted like `get_multiple_input` does
+            
+            Lines and separators are found on the mapped file, only the requested values (the first `streamsize` ones) are decoded,
+            so the memory used doesn't depend on the size of the file
+            
+            params:
+                `path`:str -> the path of the file to read
+                
+                `types`:list[Any], default:[str] -> this list contains the types to cast the values to (or a plan returned by `compile`)
+                
+                `separator`:str, default:`" "` -> this string is used to split the input values
+                
+                `input_streamsize`:int, default: None -> substitute property self.streamsize without changing its value
+                
+                `skip_empty`:bool, default: True -> empty lines are not yielded
+                
+                `encoding`:str, default: `"utf-8"` -> the encoding of the file: UTF-8 or a single byte ASCII compatible encoding (latin-1, cp1252...),
+                the lines and the separators are searched as bytes, other encodings raise WrongArgumentError
+                
+            yields:
+                `values`:list -> the elaborated data of a single line
+                
+            ~ If self.warnings is set on True, the function will show you any warnings/errors ~
+            
+            ~ If self.raise_exceptions is set on True, the function will raise exceptions if needed ~
+        """
+        import mmap
+        
+        plan = self._line_plan(types, separator, iter_separator, input_streamsize)
+        if plan is None:
+            return
+        
+        if not _byte_searchable(encoding, plan.separator):
+            raise WrongArgumentError(f"Invalid encoding: {encoding}, the file must be UTF-8 or use a single byte ASCII compatible encoding")
+        
+        parse = plan.parse
+        report = self._report
+        separator = plan.separator
+        input_streamsize = plan.streamsize
+        sep = separator.encode(encoding)
+        has_special = SPECIAL_CHARS.search
+        
+        with open(path, "rb") as file:
+            try:
+                mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError: # empty file
+                return
+            
+            with mm:
+                if hasattr(mm, "madvise"):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                
+                size = len(mm)
+                pos = 0
+                while pos < size:
+                    end = mm.find(b"\n", pos)
+                    if end == -1:
+                        end = size
+                    next_pos = end + 1
+                    if end > pos and mm[end - 1] == 13: # \r\n
+                        end -= 1
+                    
+                    if end == pos and skip_empty:
+                        pos = next_pos
+                        continue
+                    
+                    stats = self._stats
+                    if stats is not None:
+                        start = time.perf_counter_ns()
+                    
+                    if input_streamsize is None:
+                        values = split_fields(mm[pos:end].decode(encoding), separator, None, plan.iter_separator)
+                    else:
+                        # only the first input_streamsize values are sliced, the rest of the line is never read
+                        values = []
+                        start = pos
+                        while len(values) < input_streamsize:
+                            found = mm.find(sep, start, end)
+                            value = mm[start:end if found == -1 else found].decode(encoding)
+                            if has_special(value): # brackets or quotes can contain the separator
+                                values += split_fields(mm[start:end].decode(encoding), separator, input_streamsize - len(values), plan.iter_separator)
+                                break
+                            values.append(value)
+                            if found == -1:
+                                break
+                            start = found + len(sep)
+                    
+                    if stats is None:
+                        yield parse(values, report)
+                    else: # the lines are sliced from the mapped file, slicing and decoding is the split stage
+                        stats.timing("split", time.perf_counter_ns() - start)
+                        yield self._timed_cast(plan, values)
+                    pos = next_pos
+
+    def process_batch(self, lines:list[str], types:list[type]=[str], separator:str=default_kit["separator"], iter_separator:str=default_kit["iter_separator"], input_streamsize:int=None, workers:int=None, chunksize:int=None, min_parallel:int=50000, executor:"concurrent.futures.Executor"=None) -> list:
+        """This function casts a batch of raw lines like `get_multiple_input` does, using a pool of processes for big batches
+            
+            Batches smaller than `min_parallel` lines (or `workers=1`) are processed serially in the current process
+            
+            params:
+                `lines`:list[str] -> the raw lines to process
+                
+                `types`:list[Any], default:[str] -> this list contains the types to cast the values to (they must be picklable)
+                
+                `separator`:str, default:`" "` -> this string is used to split the input values
+                
+                `input_streamsize`:int, default: None -> substitute property self.streamsize without changing its value
+                
+                `workers`:int, default: None -> number of processes (default: number of cpus)
+                
+                `chunksize`:int, default: None -> lines sent to a process at once (default: a few chunks for every worker)
+                
+                `min_parallel`:int, default: 50000 -> smaller batches are processed serially
+                
+                `executor`:Executor, default: None -> an already running executor to use instead of a new process pool
+                
+            returns:
+                `records`:list -> the elaborated data of every line, in the same order of `lines`
+                
+            ~ If self.warnings is set on True, the function will show you any warnings/errors (with the number of the line) ~
+            
+            ~ If self.raise_exceptions is set on True, the function will raise the exception of the first wrong line ~
+        """
+        import concurrent.futures
+        
+        plan = self._line_plan(types, separator, iter_separator, input_streamsize)
+        if plan is None:
+            return
+        
+        lines = list(lines)
+        # the memos are not sent (they can't be pickled), every worker builds its own
+        registry = {t: (getattr(convert, "__wrapped__", convert) if memo else convert, memo) for t, (convert, memo) in self._registry.items()}
+        spec = (plan.types, plan.separator, plan.iter_separator, plan.streamsize, registry)
+        
+        if executor is None and (workers == 1 or len(lines) < min_parallel):
+            records, errors = _parse_batch(*spec, lines, 0)
+        else:
+            workers = workers or getattr(executor, "_max_workers", None) or os.cpu_count() or 1
+            chunksize = chunksize or max(1, -(-len(lines) // (workers * 4)))
+            offsets = range(0, len(lines), chunksize)
+            
+            pool = executor or concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+            try:
+                futures = [pool.submit(_parse_batch, *spec, lines[n:n + chunksize], n) for n in offsets]
+                records, errors = [], []
+                for future in futures: # results are collected in the same order of the chunks
+                    _records, _errors = future.result()
+                    records += _records
+                    errors += _errors
+            finally:
+                if executor is None:
+                    pool.shutdown()
+        
+        if self._stats is not None: # the lines are cast by the workers, only the records are counted (no stage timing)
+            for values in records:
+                self._stats.record(values, len(values))
+        
+        for n, error, message, _spec in errors:
+            self._report(error, f"line {n}: {message}", _spec)
+        
+        return records
+
+    def prefetch(self, types:list[type]=[str], depth:int=64, source:Any=None, separator:str=default_kit["separator"], iter_separator:str=default_kit["iter_separator"], input_streamsize:int=None, skip_empty:bool=True, parse_thread:bool=False) -> Prefetcher:
+        """This function starts reading the lines ahead in a background thread and returns an iterator of the records
+            
+            At most `depth` lines wait in the queue (the reader waits for the consumer), the reader stops at the end of the stream
+            
+            params:
+                `types`:list[Any], default:[str] -> this list contains the types to cast the values to (or a plan returned by `compile`)
+                
+                `depth`:int, default: 64 -> size of the queues between the reader, the parser and the consumer
+                
+                `source`:file, default: sys.stdin -> the text file object to read
+                
+                `separator`:str, default:`" "` -> this string is used to split the input values
+                
+                `input_streamsize`:int, default: None -> substitute property self.streamsize without changing its value
+                
+                `skip_empty`:bool, default: True -> empty lines are not yielded
+                
+                `parse_thread`:bool, default: False -> the lines are parsed by a second thread instead of the consumer
+                
+            returns:
+                `records`:Prefetcher -> iterator of the elaborated data of every line (use it in a `with` statement to stop it early)
+                
+            ~ If self.warnings is set on True, the function will show you any warnings/errors (in the consumer thread) ~
+            
+            ~ If self.raise_exceptions is set on True, the exceptions are raised in the consumer thread when the wrong record is reached ~
+        """
+        if not isinstance(depth, int) or depth < 1:
+            raise WrongArgumentError(f"Invalid prefetch depth: {depth}")
+        
+        plan = self._line_plan(types, separator, iter_separator, input_streamsize)
+        if plan is None:
+            return
+        
+        return Prefetcher(self, plan, sys.stdin if source is None else source, depth, skip_empty, parse_thread)
+
+    async def _areadline(self, text: str, reader: Any, timeout: float) -> str:
+        """ Async version of the builtin input(): shows `text` and awaits a line from `reader` (EOFError at the end of the stream) """
+        if text:
+            sys.stdout.write(text)
+            sys.stdout.flush()
+        
+        import asyncio
+        
+        # asyncio.TimeoutError gives back the control to the caller
+        line = await asyncio.wait_for((_STDIN if reader is None else reader).readline(), timeout)
+        if not line:
+            raise EOFError("EOF when reading a line")
+        
+        if not isinstance(line, str):
+            line = line.decode()
+        
+        if line.endswith("\n"):
+            line = line[:-2] if line.endswith("\r\n") else line[:-1]
+        
+        return line
+
+    async def aget_input(self, text:str=default_kit["text"], cast_type:type=str, includes_spaces:bool=True, input_streamsize:int=None, reader:Any=None, timeout:float=None):
+        """Coroutine version of `get_input`, the line is awaited without blocking the event loop
+            
+            sys.stdin is read by a background thread: don't call the sync functions (get_input, iter_records...) on stdin
+            while an async read is pending (e.g. after a timeout), the pending line is given to the next async call
+            
+            params:
+                `text`:str, default: `""` -> the text shown before reading
+                
+                `cast_type`:type, default: `str` -> the type to cast the value to
+                
+                `input_streamsize`:int, default: `None` -> substitute property self.streamsize without changing its value
+                
+                `reader`:asyncio.StreamReader, default: None -> the reader to use (default: sys.stdin, read by a background thread)
+                
+                `timeout`:float, default: None -> max seconds to wait for the line, then asyncio.TimeoutError is raised
+                
+            returns:
+                `value`:cast_type -> the elaborated data insert in input
+                
+            ~ If self.warnings is set on True, the function will show you any warnings/errors ~
+            
+            ~ If self.raise_exceptions is set on True, the function will raise exceptions if needed ~
+        """
+        if not self.__check_kit(): # if there's an error in the kit, replaces it with the default kit
+            self.kit = InputDevice.default_kit
+        
+        text = text if isinstance(text, str) else self.kit["text"]
+        input_streamsize = self._chars_streamsize(input_streamsize)
+        
+        if self._stats is None:
+            return self._cast_input(await self._areadline(text, reader, timeout), cast_type, includes_spaces, input_streamsize)
+        
+        start = time.perf_counter_ns() # the read stage is the time spent awaiting the line
+        return self._timed_cast_input(await self._areadline(text, reader, timeout), start, cast_type, includes_spaces, input_streamsize)
+
+    async def aget_multiple_input(self, types:list[type]=[str], text:str=default_kit["text"], separator:str=default_kit["separator"], iter_separator:str=default_kit["iter_separator"], input_streamsize:int=None, reader:Any=None, timeout:float=None) -> list:
+        """Coroutine version of `get_multiple_input`, the line is awaited without blocking the event loop
+            
+            params:
+                `types`:list[Any], default:[str] -> this list contains the types to cast the values to (or a plan returned by `compile`)
+                
+                `text`:str, default:`""` -> the text shown before reading
+                
+                `separator`:str, default:`" "` -> this string is used to split the input values
+                
+                `input_streamsize`:int, default: None -> substitute property self.streamsize without changing its value
+                
+                `reader`:asyncio.StreamReader, default: None -> the reader to use (default: sys.stdin, read by a background thread)
+                
+                `timeout`:float, default: None -> max seconds to wait for the line, then asyncio.TimeoutError is raised
+                
+            returns:
+                `values`:list -> This list contains the elaborated data insert in input
+                
+            ~ If self.warnings is set on True, the function will show you any warnings/errors ~
+            
+            ~ If self.raise_exceptions is set on True, the function will raise exceptions if needed ~
+        """
+        plan = self._line_plan(types, separator, iter_separator, input_streamsize)
+        if plan is None:
+            return
+        
+        text = text if isinstance(text, str) else self.kit["text"]
+        
+        if self._stats is None:
+            return plan.parse(plan.split(await self._areadline(text, reader, timeout)), self._report)
+        
+        start = time.perf_counter_ns()
+        return self._timed_line(plan, await self._areadline(text, reader, timeout), start)
+
+    async def arecords(self, types:list[type]=[str], reader:Any=None, separator:str=default_kit["separator"], iter_separator:str=default_kit["iter_separator"], input_streamsize:int=None, skip_empty:bool=True, timeout:float=None) -> AsyncIterator[list]:
+        """Async iterator version of `iter_records`: `async for values in device.arecords(types): ...`
+            
+            The iteration stops at the end of the stream, `timeout` is applied to every line (asyncio.TimeoutError is raised)
+            
+            ~ If self.warnings is set on True, the function will show you any warnings/errors ~
+            
+            ~ If self.raise_exceptions is set on True, the function will raise exceptions if needed ~
+        """
+        plan = self._line_plan(types, separator, iter_separator, input_streamsize)
+        if plan is None:
+            return
+        
+        parse = plan.parse
+        split = plan.split
+        report = self._report
+        
+        while True:
+            start = time.perf_counter_ns() if self._stats is not None else None
+            try:
+                line = await self._areadline("", reader, timeout)
+            except EOFError:
+                return
+            
+            if line or not skip_empty:
+                yield parse(split(line), report) if self._stats is None else self._timed_line(plan, line, start)
@@ -0,0 +1,531 @@
+# Betterinput parser plans
+# Author: Gex97
+
+import re
+import functools
+from typing import Any, Callable
+from libexceptions import *
+
+BRACKETS: dict[str, str] = {"(": ")", "[": "]", "{": "}"}
+SCALAR_ITERABLES: tuple = (str, bytes, bytearray) # iterable types that are cast as a whole token
+
+class _IterableSyntaxError(ValueError):
+    """ Raised by a field converter when the token is not a valid iterable """
+
+def raise_report(error: type, message: str, spec: Any = None):
+    """ Default report function: raises `error` with the given message """
+    raise error(message)
+
+def spec_key(spec: Any) -> Any:
+    """ Returns a hashable key for a type spec (lists of types become tuples) """
+    if isinstance(spec, (list, tuple)):
+        return (list, *map(spec_key, spec))
+    return spec
+
+QUOTES: str = "\"'"
+OPENERS: str = "([{"
+SPECIAL_CHARS = re.compile(r"[\[({\"']") # chars that can start a quoted or bracketed field, lines without them are split with str.split
+_ESCAPE = re.compile(r"\\(.)", re.DOTALL)
+
+@functools.lru_cache(maxsize=64)
+def _scanner(iter_separator: str) -> re.Pattern:
+    """ Returns a pattern matching the chars the tokenizer stops at inside brackets (brackets, quotes and the item separator) """
+    return re.compile(r"[\[\](){}\"']|" + re.escape(iter_separator))
+
+def unquote(token: str) -> str:
+    """ Returns the content of a quoted token (`"a b"` -> `a b`, `"a\"b"` -> `a"b`), other tokens are returned as they are """
+    _v = token.strip()
+    if len(_v) >= 2 and _v[0] in QUOTES and _v[-1] == _v[0]:
+        _v = _v[1:-1]
+        return _ESCAPE.sub(r"\1", _v) if "\\" in _v else _v
+
+    return token
+
+def _end_quote(text: str, start: int, end: int) -> int:
+    """ Returns the index after the quote closing the one at `start` (-1 if it's not closed before `end`), escaped quotes are skipped """
+    quote = text[start]
+    i = start + 1
+    while True:
+        i = text.find(quote, i, end)
+        if i == -1:
+            return -1
+
+        j = i - 1
+        while text[j] == "\\": # an odd number of backslashes escapes the quote
+            j -= 1
+        if (i - j) % 2:
+            return i + 1
+        i += 1
+
+def _end_bracket(text: str, start: int, end: int, iter_separator: str) -> int:
+    """ Returns the index after the bracket closing the one at `start` (-1 if it's not closed before `end`)
+
+        Nested brackets and quotes count only at the start of an item (`[don't,:(]` is a single level list)
+    """
+    closers: list[str] = [BRACKETS[text[start]]]
+    item = start + 1 # start of the current item
+
+    for m in _scanner(iter_separator).finditer(text, start + 1, end):
+        i = m.start()
+        if i < item: # inside a quoted item
+            continue
+
+        c = m.group()
+        if c == closers[-1]:
+            closers.pop()
+            if not closers:
+                return i + 1
+            item = i + 1
+        elif c == iter_separator:
+            item = m.end()
+        elif (c in QUOTES or c in OPENERS) and not text[item:i].strip():
+            if c in OPENERS:
+                closers.append(BRACKETS[c])
+                item = i + 1
+            else:
+                item = _end_quote(text, i, end)
+                if item == -1:
+                    return -1
+
+    return -1
+
+def _tokenize(line: str, separator: str, limit: int, iter_separator: str) -> tuple[list, bool]:
+    """Splits a line on the separators outside quoted and bracketed fields
+
+        returns:
+            `fields`:list -> the fields, None if a quote or a bracket is not closed
+
+            `stopped`:bool -> True if the scan stopped after `limit` fields (the rest of the line was not looked at)
+    """
+    fields: list[str] = []
+    start = 0
+    size = len(line)
+    length = len(separator)
+
+    while True:
+        c = line[start:start + 1]
+        end = start
+        quoted = False
+
+        # a field is quoted/bracketed only if it starts with a quote/opener and it's closed right before a separator
+        if c and (c in QUOTES or c in OPENERS):
+            end = _end_quote(line, start, size) if c in QUOTES else _end_bracket(line, start, size, iter_separator)
+            if end == -1:
+                return None, False
+            if end == size or line.startswith(separator, end):
+                quoted = c in QUOTES
+            else:
+                end = start # the quote/bracket is part of a plain field
+
+        found = line.find(separator, end)
+        field = line[start:size if found == -1 else found]
+        fields.append(unquote(field) if quoted else field)
+
+        if found == -1:
+            return fields, False
+
+        start = found + length
+        if limit and len(fields) == limit:
+            return fields, True
+
+def split_fields(line: str, separator: str, limit: int = None, iter_separator: str = ",") -> list[str]:
+    """This function splits a line on the separators that are not inside quoted or bracketed fields
+
+        A field is quoted (or bracketed) only if it starts with a quote (or a bracket) and ends with the closing one,
+        so apostrophes and brackets inside the text are plain chars (`don't :( 1` -> `["don't", ":(", "1"]`)\n
+        Quoted fields are unquoted (`"a b" 1` -> `["a b", "1"]`), bracketed fields are kept as they are\n
+        If a quote or a bracket is still open at the end of the line, the line is split with str.split
+
+        params:
+            `line`:str -> the line to split
+
+            `separator`:str -> the separator of the fields
+
+            `limit`:int, default: None -> max number of fields, the scan stops after them
+
+            `iter_separator`:str, default: `","` -> the separator of the items inside the brackets
+
+        returns:
+            `fields`:list[str] -> the fields of the line
+    """
+    if SPECIAL_CHARS.search(line) is not None:
+        fields, _ = _tokenize(line, separator, limit, iter_separator)
+        if fields is not None:
+            return fields
+
+    if limit:
+        return line.split(separator, limit)[0:limit] # the line is not split after the first `limit` values
+    return line.split(separator)
+
+def parse_iterable(token: str, iter_separator: str) -> list:
+    """This function parses a bracketed token in a single pass, e.g. `[1,[2,3],"a,b"]` -> `["1", ["2", "3"], "a,b"]`
+
+        Nested brackets and quotes count only at the start of an item, nested brackets become nested lists and quoted items are unquoted\n
+        Raises _IterableSyntaxError if the token is not bracketed or a nested bracket is not closed
+
+        params:
+            `token`:str -> the token to parse
+
+            `iter_separator`:str -> the separator of the items
+
+        returns:
+            `items`:list -> the items (str or list) of the iterable
+    """
+    _v = token.strip()
+    if len(_v) < 2 or BRACKETS.get(_v[0]) != _v[-1]:
+        raise _IterableSyntaxError(f"Invalid iterable syntax <{token}>")
+
+    end = len(_v) - 1
+    if SPECIAL_CHARS.search(_v, 1, end) is None:
+        return _v[1:end].split(iter_separator) if end > 1 else []
+
+    items: list = []
+    stack: list = [] # (parent items, closer of the nested iterable)
+    item = 1 # start of the current item
+    closed = False # the current item is a nested iterable, it's already in items
+    skip = 1 # end of the last quoted item
+
+    for m in _scanner(iter_separator).finditer(_v, 1, end):
+        i = m.start()
+        if i < skip:
+            continue
+
+        c = m.group()
+        if c == iter_separator:
+            if not closed:
+                items.append(unquote(_v[item:i]))
+            elif _v[item:i].strip():
+                raise _IterableSyntaxError(f"Invalid iterable syntax <{token}>")
+            item = m.end()
+            closed = False
+        elif (c in QUOTES or c in OPENERS) and not closed and not _v[item:i].strip():
+            if c in OPENERS:
+                stack.append((items, BRACKETS[c]))
+                items = []
+                item = i + 1
+            else:
+                skip = _end_quote(_v, i, end)
+                if skip == -1: # not closed, the quotes are plain chars
+                    return _v[1:end].split(iter_separator)
+        elif stack and c == stack[-1][1]:
+            if not closed and (items or _v[item:i].strip()):
+                items.append(unquote(_v[item:i]))
+            elif closed and _v[item:i].strip():
+                raise _IterableSyntaxError(f"Invalid iterable syntax <{token}>")
+            parent, _ = stack.pop()
+            parent.append(items)
+            items = parent
+            item = i + 1
+            closed = True
+        # any other bracket or quote is a plain char
+
+    if stack:
+        raise _IterableSyntaxError(f"Invalid iterable syntax <{token}>")
+
+    if not closed and (items or _v[item:end].strip()):
+        items.append(unquote(_v[item:end]))
+    elif closed and _v[item:end].strip():
+        raise _IterableSyntaxError(f"Invalid iterable syntax <{token}>")
+
+    return items
+
+# Error codes of ParseResult
+OK: int = 0
+CAST_ERROR: int = 1    # the value couldn't be cast
+SYNTAX_ERROR: int = 2  # invalid iterable syntax
+TYPE_ERROR: int = 3    # the type in the type list is not valid
+COUNT_ERROR: int = 4   # wrong number of values
+
+_DIGITS = r"\d(?:_?\d)*"
+_INT = re.compile(rf"\s*[+-]?{_DIGITS}\s*")
+_FLOAT = re.compile(rf"\s*[+-]?(?:(?:{_DIGITS}(?:\.(?:{_DIGITS})?)?|\.{_DIGITS})(?:e[+-]?{_DIGITS})?|inf(?:inity)?|nan)\s*", re.IGNORECASE)
+
+_BOOLS: dict[str, bool] = {
+    "true": True, "yes": True, "y": True, "on": True, "1": True,
+    "false": False, "no": False, "n": False, "off": False, "0": False
+}
+
+def parse_bool(token: str) -> bool:
+    """ Casts a token to bool by its meaning (`"False"` -> False), the builtin bool() would return True for every non-empty token """
+    try:
+        return _BOOLS[token.strip().lower()]
+    except KeyError:
+        raise ValueError(f"invalid literal for bool: {token!r}") from None
+
+def check_bool(token: str) -> bool:
+    return token.strip().lower() in _BOOLS
+
+def to_bytes(token: str) -> bytes:
+    return token.encode()
+
+# Built-in converters, used instead of calling the type (see InputDevice.register_converter to add or replace one)
+CONVERTERS: dict[type, Callable] = {
+    int: int,
+    float: float,
+    bool: parse_bool,
+    complex: complex,
+    bytes: to_bytes
+}
+
+# registry used by the plans: type -> (converter, size of the memo, 0 = no memo)
+DEFAULT_REGISTRY: dict[type, tuple[Callable, int]] = {t: (c, 0) for t, c in CONVERTERS.items()}
+
+def with_memos(registry: dict) -> dict:
+    """ Returns `registry` with an LRU memo around the converters with a memo size, one memo for every type (shared by all the fields of that type) """
+    if all(not memo or hasattr(convert, "cache_info") for convert, memo in registry.values()):
+        return registry
+
+    # repeated tokens cost a dict lookup
+    return {spec: (functools.lru_cache(maxsize=memo)(convert) if memo and not hasattr(convert, "cache_info") else convert, memo) for spec, (convert, memo) in registry.items()}
+
+# Exception-free checks of the built-in converters used by the validate mode, a token not matched can't be cast
+CHECKS: dict[type, Callable] = {
+    int: _INT.fullmatch,
+    float: _FLOAT.fullmatch,
+    bool: check_bool
+}
+
+class Field:
+    """A compiled type spec for a single value
+
+        `convert` gets the raw token and returns the cast value (raises ValueError, TypeError or IndexError on failure)\n
+        `error` and `message` are used to report a failed cast\n
+        `check` (optional) tells without exceptions if a token can be cast (used by ParserPlan.validate)
+    """
+    __slots__ = ("spec", "kind", "convert", "error", "message", "check")
+
+    def __init__(self, spec: Any, kind: str, convert: Callable, error: type, message: str, check: Callable = None):
+        self.spec = spec
+        self.kind = kind
+        self.convert = convert
+        self.error = error
+        self.message = message
+        self.check = check
+
+    def __repr__(self):
+        return f"Field({self.spec!r}, kind={self.kind!r})"
+
+def _type_name(spec: Any) -> str:
+    return getattr(spec, "__name__", type(spec).__name__)
+
+def _invalid(spec: Any, message: str) -> Callable:
+    def convert(token: str):
+        raise TypeError(message)
+
+    return convert
+
+def _scalar(spec: Any, registry: dict) -> Field:
+    """ Returns the Field of a scalar type using its registered converter (the type itself if there's no converter, see with_memos for the memos) """
+    try:
+        convert = registry.get(spec, (spec, 0))[0]
+    except TypeError: # unhashable spec
+        convert = spec
+
+    check = CHECKS.get(spec) if getattr(convert, "__wrapped__", convert) is CONVERTERS.get(spec) else None
+    return Field(spec, "scalar", convert, ValueCastError, f"Couldn't cast the value ({{value}}) to {_type_name(spec)}", check)
+
+def compile_field(spec: Any, iter_separator: str, registry: dict = DEFAULT_REGISTRY) -> Field:
+    """ Classifies a single type spec once and returns its Field, `registry` contains the converters (see DEFAULT_REGISTRY) """
+    if isinstance(spec, type):
+        if spec in SCALAR_ITERABLES or spec in registry:
+            return _scalar(spec, registry)
+
+        try:
+            iter(spec())
+        except Exception: # not iterable (or it cannot be built without arguments)
+            return _scalar(spec, registry)
+
+        # Is iterable (not list of types)
+        # returns an object of the given iterable type
+        def convert(token: str, container=spec):
+            return container(token if isinstance(token, list) else parse_iterable(token, iter_separator))
+
+        return Field(spec, "container", convert, TypeListError, f"Couldn't cast {{value}} to {spec.__name__} due an error... {{error}}")
+
+    if isinstance(spec, (list, tuple)):
+        if not spec:
+            return Field(spec, "invalid", _invalid(spec, "empty type list"), TypeListError, f"Couldn't cast {{value}} to {type(spec).__name__} because the type list was invalid")
+
+        # the items of a nested iterable are already parsed (lists), so nested specs like [[int]] reuse the same converters
+        converters = tuple(compile_field(t, iter_separator, registry).convert for t in spec)
+
+        if len(spec) == 1:
+            # Is iterable (is list of types)
+            # It will return a list object
+            def convert(token: str, item=converters[0]):
+                return [item(x) for x in (token if isinstance(token, list) else parse_iterable(token, iter_separator))]
+
+            return Field(spec, "list", convert, TypeListError, f"Couldn't cast {{value}} to {_type_name(spec[0])} due an error... {{error}}")
+
+        def convert(token: str, items=converters):
+            return [items[n](x) for n, x in enumerate(token if isinstance(token, list) else parse_iterable(token, iter_separator))]
+
+        return Field(spec, "positional", convert, TypeListError, f"Couldn't cast {{value}} to {[_type_name(t) for t in spec]} due an error... {{error}}")
+
+    if callable(spec):
+        return _scalar(spec, registry)
+
+    return Field(spec, "invalid", _invalid(spec, "invalid type"), ValueCastError, f"Couldn't cast the value ({{value}}) because the type ({spec}) was not valid")
+
+class ParseResult:
+    """The result of a validated line (see ParserPlan.validate)
+
+        `values`: the cast values (the raw token is kept for every wrong value)\n
+        `codes`: one error code for every value (OK, CAST_ERROR, SYNTAX_ERROR, TYPE_ERROR)\n
+        `error`: COUNT_ERROR if the number of values was wrong (values are not cast), else OK
+    """
+    __slots__ = ("values", "codes", "error")
+
+    def __init__(self, values: list, codes: bytearray, error: int = OK):
+        self.values = values
+        self.codes = codes
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return not self.error and not any(self.codes)
+
+    @property
+    def mask(self) -> int:
+        """ Bit i is set if the value i is wrong """
+        return sum(1 << i for i, code in enumerate(self.codes) if code)
+
+    @property
+    def errors(self) -> list[tuple[int, int]]:
+        """ (index, code) of every wrong value """
+        return [(i, code) for i, code in enumerate(self.codes) if code]
+
+    def __repr__(self):
+        return f"ParseResult({self.values!r}, errors={self.errors!r}, error={self.error})"
+
+class ParserPlan:
+    """A type list compiled once and reusable for every line with the same spec
+
+        Build it with `InputDevice.compile` (plans are cached by spec)
+    """
+    __slots__ = ("types", "fields", "separator", "iter_separator", "streamsize", "homogeneous", "_broadcast")
+
+    def __init__(self, types: list, separator: str = " ", iter_separator: str = ",", streamsize: int = None, registry: dict = DEFAULT_REGISTRY):
+        self.types = list(types[0:streamsize if streamsize else None])
+        self.separator = separator
+        self.iter_separator = iter_separator
+        self.streamsize = streamsize
+        registry = with_memos(registry)
+
+        # A single field (or a list of equal fields) is compiled once and broadcast on every value
+        keys = [spec_key(t) for t in self.types]
+        if keys and keys.count(keys[0]) == len(keys):
+            self.homogeneous: Field = compile_field(self.types[0], iter_separator, registry)
+            self.fields: list[Field] = [self.homogeneous] * len(self.types)
+        else:
+            self.homogeneous = None
+            self.fields = [compile_field(t, iter_separator, registry) for t in self.types]
+
+        # converter of a single scalar type, it's mapped on any number of values (the most common and cheapest plan)
+        self._broadcast: Callable = self.fields[0].convert if len(self.fields) == 1 and self.fields[0].kind == "scalar" else None
+
+    def __repr__(self):
+        return f"ParserPlan({self.types!r}, separator={self.separator!r}, iter_separator={self.iter_separator!r}, streamsize={self.streamsize})"
+
+    def memo_info(self) -> dict[int, Any]:
+        """ Returns the hits/misses (functools CacheInfo) of the memoized fields by index, the fields sharing a memo (same type) are reported once at their first index """
+        info: dict[int, Any] = {}
+        seen: set[int] = set()
+        for i, f in enumerate(self.fields):
+            if hasattr(f.convert, "cache_info") and id(f.convert) not in seen:
+                seen.add(id(f.convert))
+                info[i] = f.convert.cache_info()
+
+        return info
+
+    def split(self, line: str) -> list[str]:
+        """ Splits a raw line into its tokens (at most `streamsize` tokens), brackets and quotes are kept together """
+        return split_fields(line, self.separator, self.streamsize, self.iter_separator)
+
+    def parse_line(self, line: str, report: Callable = raise_report) -> list:
+        """ Splits and casts a raw line """
+        return self.parse(self.split(line), report)
+
+    def parse(self, values: list, report: Callable = raise_report) -> list:
+        """This function casts a list of tokens using the compiled fields
+
+            params:
+                `values`:list -> the tokens to cast (the list is modified in place)
+
+                `report`:callable, default: raise_report -> called as `report(error, message, spec)` for every failed cast
+
+            returns:
+                `values`:list -> the cast values
+        """
+        field = self.homogeneous
+        if self._broadcast is not None:
+            try:
+                return list(map(self._broadcast, values))
+            except (ValueError, TypeError):
+                pass # falls back to the per value loop to report the wrong value
+        elif len(self.fields) != len(values) and len(self.fields) != 1:
+            report(TypeListError, "Invalid number of values: expected {}, got {}".format(len(self.fields), len(values)))
+            return values
+        elif field is not None and field.kind == "scalar":
+            try:
+                return list(map(field.convert, values))
+            except (ValueError, TypeError):
+                pass
+
+        fields = self.fields
+        for i in range(len(values)):
+            if field is None:
+                f = fields[i]
+            else:
+                f = field
+
+            try:
+                values[i] = f.convert(values[i])
+            except _IterableSyntaxError as err:
+                report(f.error, str(err), f.spec)
+                return values
+            except (ValueError, TypeError, IndexError) as err:
+                report(f.error, f.message.format(value=values[i], error=err), f.spec)
+
+        return values
+
+    def validate(self, values: list) -> ParseResult:
+        """This function casts a list of tokens like `parse` does, but errors are collected instead of being reported
+
+            int and float tokens are checked without raising exceptions, no value is skipped after an error
+
+            params:
+                `values`:list -> the tokens to cast (the list is modified in place)
+
+            returns:
+                `result`:ParseResult -> the cast values and the error code of every value
+        """
+        codes = bytearray(len(values))
+        if len(self.fields) != len(values) and len(self.fields) != 1:
+            return ParseResult(values, codes, COUNT_ERROR)
+
+        field = self.homogeneous
+        if field is not None and field.kind == "scalar":
+            check = field.check
+            if check is not None and all(map(check, values)): # only good tokens, no exception can be raised
+                return ParseResult(list(map(field.convert, values)), codes)
+
+        fields = self.fields
+        for i in range(len(values)):
+            if field is None:
+                f = fields[i]
+            else:
+                f = field
+
+            if f.check is not None and not f.check(values[i]):
+                codes[i] = CAST_ERROR
+                continue
+
+            try:
+                values[i] = f.convert(values[i])
+            except _IterableSyntaxError:
+                codes[i] = SYNTAX_ERROR
+            except (ValueError, TypeError, IndexError):
+                codes[i] = TYPE_ERROR if f.kind == "invalid" else CAST_ERROR
+
+        return ParseResult(values, codes)
@@ -0,0 +1,105 @@
+# Betterinput instrumentation
+# Author: Gex97
+
+from typing import Any, Callable
+
+STAGES: tuple = ("read", "split", "cast")
+EVENTS: tuple = ("read", "split", "cast", "record", "error")
+
+def type_name(spec: Any) -> str:
+    """ Returns a readable name for a type spec, e.g. `[int, str]` -> `"[int, str]"` """
+    if isinstance(spec, (list, tuple)):
+        return "[{}]".format(", ".join(map(type_name, spec)))
+    return getattr(spec, "__name__", repr(spec))
+
+class InputStats:
+    """Counters, stage timings and hooks of an InputDevice (see InputDevice.enable_stats)
+
+        Counters: records, tokens and cast failures for every type\n
+        Timings: nanoseconds spent in every stage (read / split / cast) kept as a log2 histogram\n
+        Hooks: callbacks called as `callback(event, payload)` for the events in EVENTS\n
+        Memos: hit rates of the converter memos given by `memo_info` (a callable returning {type name: CacheInfo}), reset() doesn't clear them
+    """
+    __slots__ = ("records", "tokens", "failures", "_time", "_count", "_histogram", "_hooks", "_memo_info")
+
+    def __init__(self, memo_info: Callable = None):
+        self._hooks: dict[str, list[Callable]] = {event: [] for event in EVENTS}
+        self._memo_info = memo_info
+        self.reset()
+
+    def reset(self):
+        """ Sets every counter and timing to zero (the hooks are kept) """
+        self.records: int = 0
+        self.tokens: int = 0
+        self.failures: dict[str, int] = {}
+        self._time: dict[str, int] = dict.fromkeys(STAGES, 0)
+        self._count: dict[str, int] = dict.fromkeys(STAGES, 0)
+        self._histogram: dict[str, list[int]] = {stage: [0] * 64 for stage in STAGES}
+
+    def add_hook(self, event: str, callback: Callable):
+        """ Calls `callback(event, payload)` every time `event` happens """
+        if event not in self._hooks:
+            raise ValueError(f"Unknown event: {event}, expected one of {EVENTS}")
+        self._hooks[event].append(callback)
+
+    def remove_hook(self, event: str, callback: Callable):
+        self._hooks[event].remove(callback)
+
+    def emit(self, event: str, payload: Any):
+        for callback in self._hooks[event]:
+            callback(event, payload)
+
+    def timing(self, stage: str, ns: int):
+        """ Adds `ns` nanoseconds to `stage` """
+        self._time[stage] += ns
+        self._count[stage] += 1
+        self._histogram[stage][min(ns.bit_length(), 63)] += 1 # bucket n: from 2^(n-1) to 2^n ns
+        if self._hooks[stage]:
+            self.emit(stage, ns)
+
+    def record(self, values: Any, tokens: int):
+        """ Counts a processed record of `tokens` tokens """
+        self.records += 1
+        self.tokens += tokens
+        if self._hooks["record"]:
+            self.emit("record", values)
+
+    def failure(self, spec: Any, error: type, message: str):
+        """ Counts a cast failure of the type `spec` """
+        name = type_name(spec)
+        self.failures[name] = self.failures.get(name, 0) + 1
+        if self._hooks["error"]:
+            self.emit("error", (name, error, message))
+
+    def snapshot(self) -> dict:
+        """Returns a copy of the counters and timings, ready to be exported
+
+            timings: {stage: {"count", "total_ns", "mean_ns", "histogram": {upper bound ns: count}}}\n
+            memos: {type name: {"hits", "misses", "hit_rate", "size", "maxsize"}}
+        """
+        memos = self._memo_info() if self._memo_info is not None else {}
+        return {
+            "records": self.records,
+            "tokens": self.tokens,
+            "failures": dict(self.failures),
+            "timings": {
+                stage: {
+                    "count": self._count[stage],
+                    "total_ns": self._time[stage],
+                    "mean_ns": self._time[stage] / self._count[stage] if self._count[stage] else 0.0,
+                    "histogram": {1 << n: count for n, count in enumerate(self._histogram[stage]) if count}
+                } for stage in STAGES
+            },
+            "memos": {
+                name: {
+                    "hits": info.hits,
+                    "misses": info.misses,
+                    "hit_rate": info.hits / (info.hits + info.misses) if info.hits + info.misses else 0.0,
+                    "size": info.currsize,
+                    "maxsize": info.maxsize
+                } for name, info in memos.items()
+            }
+        }
+
+    def __repr__(self):
+        return f"InputStats(records={self.records}, tokens={self.tokens}, failures={self.failures})"
@@ -0,0 +1,38 @@
+import io
+
+import pytest
+
+from betterinput import InputDevice
+from libexceptions import ValueCastError, WrongArgumentError
+
+np = pytest.importorskip("numpy")
+
+def _device(monkeypatch, text: str, **kwargs) -> InputDevice:
+    monkeypatch.setattr("sys.stdin", io.StringIO(text))
+    return InputDevice(**kwargs)
+
+def test_read_array(monkeypatch):
+    device = _device(monkeypatch, "1 2 3\n1.5 2\n")
+    values = device.read_array(int)
+    assert isinstance(values, np.ndarray) and values.tolist() == [1, 2, 3]
+    assert device.read_array(float).tolist() == [1.5, 2.0]
+
+def test_read_array_overflow_is_reported(monkeypatch):
+    device = _device(monkeypatch, "1 99999999999999999999 3\n", raise_exceptions=True)
+    with pytest.raises(ValueCastError):
+        device.read_array(int)
+
+def test_read_array_bad_token_falls_back_to_list(monkeypatch, capsys):
+    device = _device(monkeypatch, "1 x 3\n", warnings=True)
+    assert device.read_array(int) == [1, "x", 3]
+    assert "Couldn't cast the value (x)" in capsys.readouterr().out
+
+def test_registered_converter_is_used(monkeypatch):
+    device = _device(monkeypatch, "ff 10\n")
+    device.register_converter(int, lambda token: int(token, 16))
+    assert device.read_array(int).tolist() == [255, 16]
+
+def test_as_array_and_validate_are_exclusive(monkeypatch):
+    device = _device(monkeypatch, "1 2\n")
+    with pytest.raises(WrongArgumentError):
+        device.get_multiple_input([int], as_array=True, validate=True)
@@ -0,0 +1,57 @@
+import asyncio
+import os
+
+import pytest
+
+import betterinput
+from betterinput import InputDevice, _LineReader
+
+@pytest.fixture
+def stdin(monkeypatch):
+    r, w = os.pipe()
+    source = os.fdopen(r)
+    monkeypatch.setattr(betterinput, "_STDIN", _LineReader(source))
+    with os.fdopen(w, "w", buffering=1) as writer:
+        yield writer
+    source.close()
+
+def test_line_after_timeout_survives_closed_loop(stdin):
+    device = InputDevice()
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(device.aget_input(timeout=0.1))
+
+    stdin.write("A\nB\n")
+    assert asyncio.run(device.aget_input()) == "A"
+    assert asyncio.run(device.aget_input()) == "B"
+
+def test_lines_keep_their_order_across_devices(stdin):
+    d1, d2 = InputDevice(), InputDevice()
+
+    async def main():
+        with pytest.raises(asyncio.TimeoutError):
+            await d1.aget_input(timeout=0.1)
+        stdin.write("first\nsecond\n")
+        return await d2.aget_input(), await d1.aget_input()
+
+    assert asyncio.run(main()) == ("first", "second")
+
+def test_concurrent_readers_get_every_line(stdin):
+    device = InputDevice()
+
+    async def main():
+        tasks = [asyncio.ensure_future(device.aget_input(cast_type=int)) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        stdin.write("1\n2\n3\n")
+        return await asyncio.gather(*tasks)
+
+    assert sorted(asyncio.run(main())) == [1, 2, 3]
+
+def test_arecords_stops_at_eof(stdin):
+    device = InputDevice()
+
+    async def main():
+        stdin.write("1 2\n3 4\n")
+        stdin.close()
+        return [values async for values in device.arecords([int, int])]
+
+    assert asyncio.run(main()) == [[1, 2], [3, 4]]
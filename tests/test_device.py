@@ -0,0 +1,128 @@
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _imported_after(code: str) -> set:
+    """ Returns the modules in sys.modules after running `code` in a new interpreter """
+    out = subprocess.run([sys.executable, "-c", code + "\nimport sys\nprint(' '.join(sys.modules))"], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    return set(out.split())
+
+def test_import_is_lazy():
+    modules = _imported_after("import betterinput")
+    assert not {"numpy", "asyncio", "mmap", "concurrent.futures"} & modules
+
+def test_array_mode_imports_numpy():
+    pytest.importorskip("numpy")
+    modules = _imported_after("import io, sys\nsys.stdin = io.StringIO('1 2\\n')\nimport betterinput\nbetterinput.InputDevice().read_array(int)")
+    assert "numpy" in modules
+
+from betterinput import InputDevice
+
+def _best(function, number: int = 2000, repeat: int = 5) -> float:
+    """ Best time of `number` calls """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def test_no_accessify():
+    assert "accessify" not in _imported_after("import betterinput")
+
+def test_private_properties_are_read_only():
+    device = InputDevice(warnings=True, streamsize=3)
+    for attr, value in (("warnings", False), ("raise_exceptions", True), ("streamsize", 5)):
+        with pytest.raises(AttributeError):
+            setattr(device, attr, value)
+    with pytest.raises(AttributeError):
+        device.other = 1 # __slots__, no __dict__
+
+    assert (device.warnings, device.raise_exceptions, device.streamsize) == (True, False, 3)
+
+def test_set_attribute():
+    device = InputDevice()
+    device.set_attribute("warnings", True)
+    device.set_attribute("streamsize", 4)
+    assert device.warnings and device.streamsize == 4
+    with pytest.raises(TypeError):
+        device.set_attribute("raise_exceptions", 1)
+    with pytest.raises(AttributeError):
+        device.set_attribute("missing", 1)
+
+try: # the reference device of the speed test
+    from accessify import private
+except ImportError:
+    private = None
+
+if private is not None:
+    class AccessifyDevice:
+        """ The device before the __slots__ rewrite: setters wrapped in accessify.private """
+        def __init__(self, warnings=False, raise_exceptions=False, streamsize=None):
+            self.warnings = warnings
+            self.raise_exceptions = raise_exceptions
+            self.streamsize = streamsize
+
+        @property
+        def warnings(self):
+            return self._warnings
+
+        @warnings.setter
+        @private
+        def warnings(self, state):
+            if not isinstance(state, bool):
+                raise TypeError(state)
+            self._warnings = state
+
+        @property
+        def raise_exceptions(self):
+            return self._raise_exceptions
+
+        @raise_exceptions.setter
+        @private
+        def raise_exceptions(self, state):
+            if not isinstance(state, bool):
+                raise TypeError(state)
+            self._raise_exceptions = state
+
+        @property
+        def streamsize(self):
+            return self._streamsize
+
+        @streamsize.setter
+        @private
+        def streamsize(self, size):
+            self._streamsize = size if size and size > 0 else None
+
+        def set_attribute(self, attr, value):
+            if attr == "streamsize":
+                self.streamsize = value
+            elif attr == "warnings":
+                self.warnings = value
+            else:
+                self.raise_exceptions = value
+
+@pytest.mark.skipif(private is None, reason="accessify is not installed")
+def test_order_of_magnitude_faster_than_accessify():
+    old, new = AccessifyDevice(), InputDevice()
+    assert _best(lambda: AccessifyDevice(True, False, 4)) >= 10 * _best(lambda: InputDevice(True, False, 4))
+    assert _best(lambda: old.set_attribute("streamsize", 4)) >= 10 * _best(lambda: new.set_attribute("streamsize", 4))
+
+def test_compile_reuses_plans():
+    device = InputDevice()
+    flat, nested = device.compile([int, str]), device.compile([[int], str])
+    assert device.compile((int, str)) is flat
+    assert device.compile([[int], str]) is nested
+    assert device.compile(flat) is flat
+    assert device.compile([int, str], separator=",") is not flat
+
+def test_process_data_single_type():
+    device = InputDevice()
+    assert device.process_data(["1", "2", "3"], [int]) == [1, 2, 3]
+    assert device.process_data(["1", "x", "3"], [int]) == [1, "x", 3] # the bad token is reported and kept
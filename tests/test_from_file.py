@@ -0,0 +1,29 @@
+import pytest
+
+from betterinput import InputDevice
+from libexceptions import WrongArgumentError
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / "data.txt"
+
+def test_lines_and_streamsize(path):
+    path.write_bytes(b"1 2 3\r\n\n4 5 6\n\"a b\" 7 8")
+    device = InputDevice()
+    assert list(device.from_file(str(path), [str])) == [["1", "2", "3"], ["4", "5", "6"], ["a b", "7", "8"]]
+    assert list(device.from_file(str(path), [str], input_streamsize=2)) == [["1", "2"], ["4", "5"], ["a b", "7"]]
+
+def test_empty_file(path):
+    path.write_bytes(b"")
+    assert list(InputDevice().from_file(str(path), [int])) == []
+
+@pytest.mark.parametrize("encoding", ["utf-8", "latin-1", "cp1252"])
+def test_ascii_compatible_encodings(path, encoding):
+    path.write_bytes("é 1\nà 2\n".encode(encoding))
+    assert list(InputDevice().from_file(str(path), [str, int], encoding=encoding)) == [["é", 1], ["à", 2]]
+
+@pytest.mark.parametrize("encoding", ["utf-16", "utf-32", "cp500", "shift_jis", "no-such-codec"])
+def test_other_encodings_are_rejected(path, encoding):
+    path.write_bytes(b"")
+    with pytest.raises(WrongArgumentError):
+        list(InputDevice().from_file(str(path), [str], encoding=encoding))
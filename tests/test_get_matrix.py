@@ -0,0 +1,111 @@
+import array
+import io
+
+import pytest
+
+from betterinput import InputDevice
+from libexceptions import TypeListError, ValueCastError, WrongArgumentError
+
+def _device(monkeypatch, text: str, **kwargs) -> InputDevice:
+    monkeypatch.setattr("sys.stdin", io.StringIO(text))
+    return InputDevice(**kwargs)
+
+def test_list_storage(monkeypatch):
+    device = _device(monkeypatch, "a 1 2.5\nb 2 3.5\n")
+    assert device.get_matrix(2, [str, int, float]) == [["a", 1, 2.5], ["b", 2, 3.5]]
+
+def test_list_storage_single_type_takes_the_width_of_the_first_line(monkeypatch):
+    device = _device(monkeypatch, "1 2 3\n4 5 6\n")
+    assert device.get_matrix(2, [int]) == [[1, 2, 3], [4, 5, 6]]
+
+def test_list_storage_column_major(monkeypatch):
+    device = _device(monkeypatch, "1 2 3\n4 5 6\n")
+    assert device.get_matrix(2, [int], column_major=True) == [[1, 4], [2, 5], [3, 6]]
+
+def test_array_storage(monkeypatch):
+    device = _device(monkeypatch, "1 2\n3 4\n5 6\n")
+    matrix = device.get_matrix(3, [int], storage="array")
+    assert [column.typecode for column in matrix] == ["q", "q"]
+    assert [column.tolist() for column in matrix] == [[1, 3, 5], [2, 4, 6]]
+
+def test_array_storage_float(monkeypatch):
+    device = _device(monkeypatch, "1.5 2\n")
+    matrix = device.get_matrix(1, [float], storage="array")
+    assert matrix == [array.array("d", [1.5]), array.array("d", [2.0])]
+
+def test_array_storage_needs_numeric_values(monkeypatch, capsys):
+    device = _device(monkeypatch, "a b\n", warnings=True)
+    assert device.get_matrix(1, [str], storage="array") == [["a", "b"]]
+    assert "Couldn't use array storage" in capsys.readouterr().out
+
+def test_array_storage_overflow_is_reported(monkeypatch):
+    device = _device(monkeypatch, "1 99999999999999999999999\n", raise_exceptions=True)
+    with pytest.raises(ValueCastError):
+        device.get_matrix(1, [int], storage="array")
+
+@pytest.mark.parametrize("storage, column_major, expected", [
+    ("list", False, [[1, 2], ["x"], [5, 6]]),
+    ("list", True, [[1, None, 5], [2, None, 6]]),
+    ("array", False, [[1, 0, 5], [2, 0, 6]]),
+])
+def test_wrong_number_of_values(monkeypatch, capsys, storage, column_major, expected):
+    device = _device(monkeypatch, "1 2\nx\n5 6\n", warnings=True)
+    matrix = device.get_matrix(3, [int], storage=storage, column_major=column_major)
+    assert [list(row) for row in matrix] == expected
+    assert "Invalid number of values in row 1: expected 2, got 1" in capsys.readouterr().out
+
+def test_wrong_number_of_values_raises(monkeypatch):
+    device = _device(monkeypatch, "1 2 3\n4 5\n", raise_exceptions=True)
+    with pytest.raises(TypeListError):
+        device.get_matrix(2, [int, int, int])
+
+@pytest.mark.parametrize("storage, column_major, expected", [
+    ("list", False, []),
+    ("list", True, [[], []]),
+    ("array", False, [array.array("q"), array.array("q")]),
+    ("array", True, [array.array("q"), array.array("q")]),
+])
+def test_zero_rows(monkeypatch, storage, column_major, expected):
+    device = _device(monkeypatch, "1 2\n")
+    assert device.get_matrix(0, [int, int], storage=storage, column_major=column_major) == expected
+    assert input() == "1 2" # no line was read
+
+@pytest.mark.parametrize("rows, storage", [(-1, "list"), (1.5, "list"), (1, "dict")])
+def test_invalid_arguments(monkeypatch, rows, storage):
+    device = _device(monkeypatch, "1\n")
+    with pytest.raises(WrongArgumentError):
+        device.get_matrix(rows, [int], storage=storage)
+
+def test_numpy_storage(monkeypatch):
+    np = pytest.importorskip("numpy")
+    device = _device(monkeypatch, "1 2 3\n4 5 6\n")
+    matrix = device.get_matrix(2, [int], storage="numpy")
+    assert isinstance(matrix, np.ndarray) and matrix.shape == (2, 3)
+    assert matrix.tolist() == [[1, 2, 3], [4, 5, 6]]
+
+def test_numpy_storage_column_major(monkeypatch):
+    pytest.importorskip("numpy")
+    device = _device(monkeypatch, "1.5 2\n3 4\n")
+    matrix = device.get_matrix(2, [float], storage="numpy", column_major=True)
+    assert matrix.shape == (2, 2) and matrix.tolist() == [[1.5, 3.0], [2.0, 4.0]]
+
+@pytest.mark.parametrize("column_major, shape", [(False, (0, 3)), (True, (3, 0))])
+def test_numpy_zero_rows_honors_column_major(monkeypatch, column_major, shape):
+    pytest.importorskip("numpy")
+    device = _device(monkeypatch, "")
+    assert device.get_matrix(0, [int, int, int], storage="numpy", column_major=column_major).shape == shape
+
+@pytest.mark.parametrize("column_major", [False, True])
+def test_numpy_bad_token_keeps_the_valid_values(monkeypatch, capsys, column_major):
+    pytest.importorskip("numpy")
+    device = _device(monkeypatch, "1 2 3\n4 x 6\n", warnings=True)
+    matrix = device.get_matrix(2, [int], storage="numpy", column_major=column_major)
+    expected = [[1, 2, 3], [4, 0, 6]]
+    assert matrix.tolist() == (list(map(list, zip(*expected))) if column_major else expected)
+    assert "Couldn't cast the value (x)" in capsys.readouterr().out
+
+def test_numpy_overflow_is_reported(monkeypatch):
+    pytest.importorskip("numpy")
+    device = _device(monkeypatch, "1 99999999999999999999999\n", raise_exceptions=True)
+    with pytest.raises(ValueCastError):
+        device.get_matrix(1, [int], storage="numpy")
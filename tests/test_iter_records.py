@@ -0,0 +1,45 @@
+import io
+import os
+import threading
+
+import pytest
+
+from betterinput import InputDevice
+
+def test_text_and_binary_sources():
+    device = InputDevice()
+    text = io.StringIO("1 2\r\n\n3 4\n5 6")
+    assert list(device.iter_records([int, int], text)) == [[1, 2], [3, 4], [5, 6]]
+
+    binary = io.BytesIO("à 1\nè 2\n".encode())
+    assert list(device.iter_records([str, int], binary, chunksize=3)) == [["à", 1], ["è", 2]]
+
+def test_follows_previous_reads():
+    source = io.StringIO("9\n1 2\n3 4\n")
+    source.readline()
+    assert list(InputDevice().iter_records([int, int], source)) == [[1, 2], [3, 4]]
+
+@pytest.mark.parametrize("mode", ["r", "rb"])
+def test_pipe_records_come_as_soon_as_their_line(mode):
+    r, w = os.pipe()
+    got_first = threading.Event()
+    waited: list = []
+
+    def produce():
+        with os.fdopen(w, "w") as writer:
+            writer.write("1 2\n")
+            writer.flush()
+            waited.append(got_first.wait(5)) # the first record must come before the rest of the stream
+            writer.write("3 4\n")
+
+    producer = threading.Thread(target=produce)
+    producer.start()
+    records = []
+    with os.fdopen(r, mode) as source:
+        for values in InputDevice().iter_records([int, int], source):
+            records.append(values)
+            got_first.set()
+    producer.join()
+
+    assert records == [[1, 2], [3, 4]]
+    assert waited == [True]
@@ -0,0 +1,60 @@
+import pytest
+
+from libparser import ParserPlan, split_fields, parse_iterable, _IterableSyntaxError
+
+@pytest.mark.parametrize("line, expected", [
+    ("don't 1 2", ["don't", "1", "2"]),
+    ("smile :( ok 3", ["smile", ":(", "ok", "3"]),
+    ("C:\\new\\dir 1", ["C:\\new\\dir", "1"]),
+    ("it's [1,2]", ["it's", "[1,2]"]),
+    ("'a 1", ["'a", "1"]),
+    ("[1, 2 3", ["[1,", "2", "3"]),
+])
+def test_split_plain_text(line, expected):
+    assert split_fields(line, " ") == expected
+
+@pytest.mark.parametrize("line, expected", [
+    ('"a b" 1', ["a b", "1"]),
+    ("'a b' 'c'", ["a b", "c"]),
+    ('"a \\" b" 1', ['a " b', "1"]),
+    ('["a,b",c] 2', ['["a,b",c]', "2"]),
+    ("[1, [2, 3]] 4", ["[1, [2, 3]]", "4"]),
+])
+def test_split_quoted_and_bracketed(line, expected):
+    assert split_fields(line, " ") == expected
+
+def test_split_limit():
+    assert split_fields('"a b" 1 2', " ", 2) == ["a b", "1"]
+    assert split_fields("1 2 3", " ", 2) == ["1", "2"]
+
+@pytest.mark.parametrize("token, expected", [
+    ("[don't,x]", ["don't", "x"]),
+    ("[:(,x]", [":(", "x"]),
+    ('["a,b",c]', ["a,b", "c"]),
+    ("[[1,2],[3]]", [["1", "2"], ["3"]]),
+    ("[]", []),
+])
+def test_parse_iterable(token, expected):
+    assert parse_iterable(token, ",") == expected
+
+@pytest.mark.parametrize("token", ["1,2", "[[1,2]", "[[1]x,2]"])
+def test_parse_iterable_syntax_error(token):
+    with pytest.raises(_IterableSyntaxError):
+        parse_iterable(token, ",")
+
+def test_plan_nested_iterables():
+    plan = ParserPlan([[[int]], str])
+    assert plan.parse_line("[[1,2],[3]] don't") == [[[1, 2], [3]], "don't"]
+
+def test_plan_quoted_separators():
+    plan = ParserPlan([str, [str], int])
+    assert plan.parse_line('"a b" ["a,b",c] 1') == ["a b", ["a,b", "c"], 1]
+
+def test_homogeneous_plan_shares_memo():
+    registry = {str: (str, 8)}
+    plan = ParserPlan([str, str], registry=registry)
+    plan.parse_line("a a")
+    plan.parse_line("a b")
+    info = plan.memo_info()
+    assert list(info) == [0]
+    assert (info[0].hits, info[0].misses) == (2, 2)
@@ -0,0 +1,50 @@
+import io
+
+import pytest
+
+from betterinput import InputDevice
+from libexceptions import ValueCastError
+
+class _BrokenSource:
+    """ A source failing after its first line """
+    def __init__(self):
+        self.lines = iter(["1 2\n"])
+
+    def readline(self) -> str:
+        for line in self.lines:
+            return line
+        raise OSError("broken pipe")
+
+@pytest.mark.parametrize("parse_thread", [False, True])
+def test_records_in_order(parse_thread):
+    source = io.StringIO("".join(f"{n} {n + 1}\n" for n in range(500)))
+    with InputDevice().prefetch([int, int], depth=4, source=source, parse_thread=parse_thread) as records:
+        assert list(records) == [[n, n + 1] for n in range(500)]
+
+@pytest.mark.parametrize("parse_thread", [False, True])
+def test_reader_error_is_forwarded(parse_thread):
+    with InputDevice().prefetch([int], source=_BrokenSource(), parse_thread=parse_thread) as records:
+        assert next(records) == [1, 2]
+        with pytest.raises(OSError):
+            next(records)
+
+def test_parser_error_is_forwarded():
+    device = InputDevice()
+    device.register_converter(int, lambda token: {}[token])
+    with device.prefetch([int], source=io.StringIO("1\n2\n"), parse_thread=True) as records:
+        with pytest.raises(KeyError):
+            next(records)
+
+@pytest.mark.parametrize("parse_thread", [False, True])
+def test_cast_errors_follow_the_policy(parse_thread):
+    device = InputDevice(raise_exceptions=True)
+    with device.prefetch([int], source=io.StringIO("1\nx\n"), parse_thread=parse_thread) as records:
+        assert next(records) == [1]
+        with pytest.raises(ValueCastError):
+            next(records)
+
+def test_close_before_the_end():
+    source = io.StringIO("1\n" * 10000)
+    for _ in range(20):
+        with InputDevice().prefetch([int], depth=2, source=source, parse_thread=True) as records:
+            next(records)
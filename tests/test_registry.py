@@ -0,0 +1,70 @@
+import io
+
+import pytest
+
+from betterinput import InputDevice
+
+class Status:
+    def __init__(self, token: str):
+        self.token = token
+
+def test_registered_converters():
+    device = InputDevice()
+    assert device.process_data(["False", "yes"], [bool]) == [False, True]
+    device.register_converter(int, lambda token: int(token, 16))
+    assert device.process_data(["ff"], [int]) == [255]
+    assert InputDevice().process_data(["10"], [int]) == [10] # other devices keep the built-in converter
+    device.unregister_converter(int)
+    assert device.process_data(["10"], [int]) == [10]
+
+def test_get_input_uses_the_registry(monkeypatch):
+    monkeypatch.setattr("sys.stdin", io.StringIO("False\n"))
+    assert InputDevice().get_input(cast_type=bool) is False
+
+def test_one_memo_per_type():
+    device = InputDevice()
+    device.register_converter(Status, memo=8)
+    plan = device.compile([Status, int, Status])
+    first, _, last = device.process_data(["a", "1", "a"], plan)
+    assert first is last
+    assert list(plan.memo_info()) == [0] # the fields of the same type share a memo
+    assert device.compile([Status]).fields[0].convert is plan.fields[0].convert
+
+    info = device.memo_info()["Status"]
+    assert (info.hits, info.misses) == (1, 1)
+
+def test_memos_belong_to_the_device():
+    d1, d2 = InputDevice(), InputDevice()
+    for device in (d1, d2):
+        device.register_converter(Status, memo=8)
+    d1.process_data(["a", "a"], [Status])
+    assert d1.memo_info()["Status"].hits == 1
+    assert d2.memo_info()["Status"].hits == 0
+
+def test_memo_survives_the_plans_cache(monkeypatch):
+    device = InputDevice()
+    device.register_converter(Status, memo=8)
+    device.process_data(["a"], [Status])
+    InputDevice._plans.clear()
+    device.process_data(["a"], [Status])
+    assert device.memo_info()["Status"].hits == 1
+
+def test_memo_kept_when_registering_other_types():
+    device = InputDevice()
+    device.register_converter(Status, memo=8)
+    device.process_data(["a"], [Status])
+    device.register_converter(int, memo=4)
+    device.process_data(["a"], [Status])
+    assert device.memo_info()["Status"].hits == 1
+    device.register_converter(Status) # new memo size 0: the memo is dropped, the converter is kept
+    assert "Status" not in device.memo_info()
+    assert isinstance(device.process_data(["a"], [Status])[0], Status)
+
+def test_memo_hit_rate_in_snapshot():
+    device = InputDevice()
+    device.register_converter(Status, memo=8)
+    stats = device.enable_stats()
+    device.process_data(["a", "a", "a", "b"], [Status])
+    memo = stats.snapshot()["memos"]["Status"]
+    assert (memo["hits"], memo["misses"], memo["size"], memo["maxsize"]) == (2, 2, 2, 8)
+    assert memo["hit_rate"] == pytest.approx(0.5)
@@ -0,0 +1,79 @@
+import asyncio
+import io
+
+import pytest
+
+from betterinput import InputDevice
+
+LINES = "1 2\n3 x\n5 6\n"
+
+@pytest.fixture
+def device(monkeypatch):
+    monkeypatch.setattr("sys.stdin", io.StringIO(LINES))
+    device = InputDevice()
+    device.enable_stats()
+    return device
+
+def _check(stats, records=3, stages=("read", "split", "cast")):
+    snapshot = stats.snapshot()
+    assert snapshot["records"] == records
+    assert snapshot["tokens"] == 2 * records
+    assert snapshot["failures"] == {"int": 1}
+    for stage in stages:
+        assert snapshot["timings"][stage]["count"] == records
+
+def test_get_multiple_input(device):
+    for _ in range(3):
+        device.get_multiple_input([int])
+    _check(device.stats)
+
+def test_get_input(device):
+    for _ in range(3):
+        device.get_input(cast_type=int)
+    assert device.stats.records == 3
+    assert device.stats.failures == {"int": 3} # "1 2" and "5 6" are not int either
+
+def test_get_matrix(device):
+    device.get_matrix(3, [int, int])
+    _check(device.stats)
+
+def test_iter_records(device):
+    list(device.iter_records([int]))
+    _check(device.stats, stages=("split", "cast"))
+
+def test_from_file(device, tmp_path):
+    path = tmp_path / "data.txt"
+    path.write_text(LINES)
+    list(device.from_file(str(path), [int]))
+    _check(device.stats, stages=("split", "cast"))
+
+def test_process_batch(device):
+    device.process_batch(LINES.splitlines(), [int])
+    _check(device.stats, stages=())
+
+@pytest.mark.parametrize("parse_thread", [False, True])
+def test_prefetch(device, parse_thread):
+    with device.prefetch([int], parse_thread=parse_thread) as records:
+        list(records)
+    _check(device.stats, stages=() if parse_thread else ("split", "cast"))
+
+def test_async(device):
+    class Reader:
+        def __init__(self):
+            self.lines = io.StringIO(LINES * 2)
+
+        async def readline(self):
+            return self.lines.readline()
+
+    reader = Reader()
+
+    async def main():
+        await device.aget_multiple_input([int], reader=reader)
+        await device.aget_input(cast_type=int, reader=reader)
+        return [values async for values in device.arecords([int], reader)]
+
+    asyncio.run(main())
+    snapshot = device.stats.snapshot()
+    assert snapshot["records"] == 6
+    assert snapshot["failures"] == {"int": 2}
+    assert snapshot["timings"]["read"]["count"] == 6
@@ -0,0 +1,33 @@
+import io
+
+import pytest
+
+from betterinput import InputDevice
+
+class _Source(io.StringIO):
+    """ stdin that records the size of every chunk read """
+    def __init__(self, text: str):
+        super().__init__(text)
+        self.chunks: list[int] = []
+
+    def readline(self, size: int = -1) -> str:
+        line = super().readline(size)
+        self.chunks.append(len(line))
+        return line
+
+@pytest.mark.parametrize("head", ["1", "[1", "\"1", "[1,2]"])
+def test_bounded_read(monkeypatch, head):
+    source = _Source(head + " 2" * 500_000 + "\n3 4\n")
+    monkeypatch.setattr("sys.stdin", source)
+    device = InputDevice(streamsize=2)
+
+    values = device.get_multiple_input([str])
+    assert values[1] == "2"
+    assert max(source.chunks) <= InputDevice.read_chunksize # the rest of the line is skipped in chunks
+    assert device.get_multiple_input([int]) == [3, 4]
+
+def test_get_input_max_chars(monkeypatch):
+    monkeypatch.setattr("sys.stdin", _Source("abcdef\nxyz\n"))
+    device = InputDevice()
+    assert device.get_input(input_streamsize=3) == "abc"
+    assert device.get_input() == "xyz"
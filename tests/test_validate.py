@@ -0,0 +1,53 @@
+import pytest
+
+from libparser import ParserPlan, CHECKS, OK, CAST_ERROR, SYNTAX_ERROR, COUNT_ERROR, TYPE_ERROR, parse_bool
+
+TOKENS = [
+    "0", "7", "-7", "+7", " 42 ", "\t1\n", "007", "1_000", "1__000", "_1", "1_", "", " ", "+", "-", "1 2", "0x10", "١٢",
+    "1.", ".5", "1.5", "-1.5e3", "1E5", "1e", "1e+", "1.5e-3", "1_0.0_1", "1.0e1_0", ".", "e5", "1..2",
+    "inf", "-inf", "+Infinity", "INFINITY", "infinit", "nan", "-NaN", "nana", "1,5", "abc", "True", "no",
+]
+
+def _casts(convert, token: str) -> bool:
+    try:
+        convert(token)
+    except ValueError:
+        return False
+    return True
+
+@pytest.mark.parametrize("token", TOKENS)
+@pytest.mark.parametrize("spec, convert", [(int, int), (float, float), (bool, parse_bool)])
+def test_checks_agree_with_the_converters(spec, convert, token):
+    assert bool(CHECKS[spec](token)) == _casts(convert, token)
+
+def test_all_good_values():
+    result = ParserPlan([int]).validate(["1", "2", "3"])
+    assert result.ok and result.values == [1, 2, 3]
+    assert result.mask == 0 and result.errors == []
+
+def test_error_codes_and_mask():
+    plan = ParserPlan([int, float, [int], bool, "nope"])
+    result = plan.validate(["1", "x", "[1,2", "maybe", "z"])
+    assert not result.ok
+    assert result.values[:1] == [1]
+    assert result.errors == [(1, CAST_ERROR), (2, SYNTAX_ERROR), (3, CAST_ERROR), (4, TYPE_ERROR)]
+    assert result.mask == 0b11110
+    assert list(result.codes) == [OK, CAST_ERROR, SYNTAX_ERROR, CAST_ERROR, TYPE_ERROR]
+
+def test_no_value_is_skipped_after_an_error():
+    result = ParserPlan([int]).validate(["x", "2", "y", "4"])
+    assert result.values == ["x", 2, "y", 4]
+    assert result.mask == 0b0101
+
+def test_count_error():
+    result = ParserPlan([int, int]).validate(["1", "2", "3"])
+    assert result.error == COUNT_ERROR and not result.ok
+    assert result.values == ["1", "2", "3"] # not cast
+
+def test_validate_never_prints(capsys):
+    from betterinput import InputDevice
+
+    device = InputDevice(warnings=True)
+    result = device.process_data(["1", "x"], [int], validate=True)
+    assert result.mask == 0b10
+    assert capsys.readouterr().out == ""